@@ -0,0 +1,30 @@
+"""keyset pagination indexes
+
+Revision ID: 3f9c2d7a1b84
+Revises: 
+Create Date: 2026-10-18 10:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2d7a1b84'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_clients_name_id', 'clients', ['name', 'id'], unique=False)
+    op.create_index('ix_products_name_id', 'products', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_name_id', table_name='products')
+    op.drop_index('ix_clients_name_id', table_name='clients')
@@ -0,0 +1,54 @@
+"""sales daily rollup
+
+Revision ID: b5e2f19a7c03
+Revises: 8d41e6b0c27f
+Create Date: 2026-10-18 13:21:07.554302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2f19a7c03'
+down_revision: Union[str, None] = '8d41e6b0c27f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sales_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('section', sa.String(length=100), server_default=sa.text("''"), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('revenue', sa.Numeric(precision=14, scale=2), server_default=sa.text('0'), nullable=False),
+        sa.Column('order_lines', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()') if op.get_bind().dialect.name == 'postgresql' else sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('day', 'section', 'product_id')
+    )
+    op.create_index('ix_sales_daily_section_day', 'sales_daily', ['section', 'day'], unique=False)
+    op.create_index('ix_sales_daily_product_day', 'sales_daily', ['product_id', 'day'], unique=False)
+
+    # backfill a partir dos itens já existentes (dia em UTC, como nos serviços)
+    day = "(o.created_at AT TIME ZONE 'UTC')::date" if op.get_bind().dialect.name == 'postgresql' else "date(o.created_at)"
+    op.execute(
+        "INSERT INTO sales_daily (day, section, product_id, quantity, revenue, order_lines) "
+        f"SELECT {day}, COALESCE(p.section, ''), op.product_id, SUM(op.quantity), SUM(op.quantity * op.price_at_moment), COUNT(*) "
+        "FROM order_products op "
+        "JOIN orders o ON o.id = op.order_id "
+        "JOIN products p ON p.id = op.product_id "
+        f"GROUP BY {day}, COALESCE(p.section, ''), op.product_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sales_daily_product_day', table_name='sales_daily')
+    op.drop_index('ix_sales_daily_section_day', table_name='sales_daily')
+    op.drop_table('sales_daily')
@@ -0,0 +1,39 @@
+"""order filter indexes
+
+Revision ID: c71a4d93e5b8
+Revises: b5e2f19a7c03
+Create Date: 2026-10-18 14:02:44.870215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71a4d93e5b8'
+down_revision: Union[str, None] = 'b5e2f19a7c03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_orders_client_id_created_at', 'orders', ['client_id', 'created_at'], unique=False)
+    op.create_index('ix_orders_status_created_at', 'orders', ['status', 'created_at'], unique=False)
+    op.create_index('ix_order_products_product_id_order_id', 'order_products', ['product_id', 'order_id'], unique=False)
+    # os índices compostos começam pelas mesmas colunas, então os simples ficam redundantes
+    op.drop_index('ix_orders_client_id', table_name='orders', if_exists=True)
+    op.drop_index('ix_orders_status', table_name='orders', if_exists=True)
+    # products(section) já existe desde o modelo original (index=True)
+    op.create_index('ix_products_section', 'products', ['section'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_orders_status', 'orders', ['status'], unique=False)
+    op.create_index('ix_orders_client_id', 'orders', ['client_id'], unique=False)
+    op.drop_index('ix_order_products_product_id_order_id', table_name='order_products')
+    op.drop_index('ix_orders_status_created_at', table_name='orders')
+    op.drop_index('ix_orders_client_id_created_at', table_name='orders')
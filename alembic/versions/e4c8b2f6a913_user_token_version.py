@@ -0,0 +1,28 @@
+"""user token version
+
+Revision ID: e4c8b2f6a913
+Revises: c71a4d93e5b8
+Create Date: 2026-10-18 14:47:19.205861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c8b2f6a913'
+down_revision: Union[str, None] = 'c71a4d93e5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default=sa.text('0'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
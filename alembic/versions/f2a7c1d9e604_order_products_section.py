@@ -0,0 +1,34 @@
+"""order products section
+
+Revision ID: f2a7c1d9e604
+Revises: e4c8b2f6a913
+Create Date: 2026-10-18 17:12:40.518372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c1d9e604'
+down_revision: Union[str, None] = 'e4c8b2f6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('order_products', sa.Column('section', sa.String(length=100), nullable=True))
+
+    # itens já existentes: mesma seção que o backfill de sales_daily usou (a atual do produto)
+    op.execute(
+        "UPDATE order_products SET section = "
+        "(SELECT products.section FROM products WHERE products.id = order_products.product_id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('order_products', 'section')
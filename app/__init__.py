@@ -1,5 +1,12 @@
+import logging
 from fastapi import FastAPI
+from app.core.config import settings
+from app.core.admission import AdmissionMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.query_log import NPlusOneMiddleware
+from app.core.replica import ReadYourWritesMiddleware
 from app.routes import create_routes
+from app.utils.fast_json import orjson
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -9,4 +16,23 @@ def create_app() -> FastAPI:
 
     create_routes(instance_fastapi=app)
 
+    if settings.FAST_JSON_RESPONSES and orjson is None:
+        logging.getLogger("app").warning(
+            "FAST_JSON_RESPONSES ligado sem o pacote orjson: as respostas usam o json da biblioteca padrão "
+            "(instale com `pip install orjson`)."
+        )
+
+    # a ordem importa: o último adicionado é o mais externo (métricas também contam os 503 da admissão)
+    if settings.DATABASE_REPLICA_URL:
+        app.add_middleware(ReadYourWritesMiddleware)
+
+    if settings.ADMISSION_CONTROL_ENABLED:
+        app.add_middleware(AdmissionMiddleware)
+
+    if settings.DB_N_PLUS_ONE_THRESHOLD > 0:
+        app.add_middleware(NPlusOneMiddleware)
+
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
     return app
\ No newline at end of file
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Dict
+from starlette.responses import JSONResponse
+from app.core.config import settings
+
+BUSY_DETAIL = "Servidor ocupado, tente novamente em instantes."
+
+# rotas que nunca passam pela admissão (monitoramento precisa responder justamente sob carga)
+EXEMPT_PATHS = {"/health", "/ready", "/metrics"}
+# rotas que rodam bcrypt
+AUTH_PATHS = {"/auth/login", "/auth/register", "/auth/refresh-token"}
+LIST_PATHS = {"/clients/", "/products/", "/orders/", "/order-products/", "/reports/sales"}
+
+class AdmissionClass:
+    """
+    Limite de requisições simultâneas de uma classe de rotas, por worker.
+
+    - Até `limit` requisições executam ao mesmo tempo.
+    - Até `queue_size` aguardam vaga, cada uma por no máximo `timeout` segundos.
+    - Fora disso a requisição é recusada na hora (503), em vez de esperar por uma conexão do pool.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.limit and self.waiting >= self.queue_size
+
+    async def acquire(self) -> bool:
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.rejected += 1
+                return False
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+admission_classes = {
+    "auth": AdmissionClass("auth", settings.ADMISSION_AUTH_LIMIT, settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS),
+    "list": AdmissionClass("list", settings.ADMISSION_LIST_LIMIT, settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS),
+    "default": AdmissionClass("default", settings.ADMISSION_DEFAULT_LIMIT, settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS),
+}
+
+def classify(method: str, path: str) -> str:
+    if path in AUTH_PATHS:
+        return "auth"
+    if method == "GET" and path in LIST_PATHS:
+        return "list"
+    return "default"
+
+def admission_stats() -> Dict[str, Any]:
+    return {name: admission.stats() for name, admission in admission_classes.items()}
+
+
+class AdmissionMiddleware:
+    """
+    Controle de admissão (ASGI puro): login (bcrypt), listagens e demais rotas têm limites separados,
+    para que uma classe lenta não consuma todas as conexões do pool das outras.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            return await self.app(scope, receive, send)
+
+        admission = admission_classes[classify(scope["method"], scope["path"])]
+
+        if not await admission.acquire():
+            response = JSONResponse({"detail": BUSY_DETAIL}, status_code=503, headers={"Retry-After": "1"})
+            return await response(scope, receive, send)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release()
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, Hashable, Optional
+
+class TTLCache:
+    """
+    Cache em memória (por processo) com expiração por TTL e descarte LRU.
+
+    - `maxsize`: quantidade máxima de entradas; ao estourar, remove a menos usada.
+    - `ttl`: tempo de vida (em segundos) de cada entrada.
+    - `hits`/`misses`: contadores expostos via `stats()`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+
+        if expires_at <= monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+
+        self._data[key] = (monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
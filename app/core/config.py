@@ -1,10 +1,53 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 5
+    REPLICA_LAG_CHECK_SECONDS: float = 2
+    # janela em que quem gravou lê do primário; vale entre workers via cookie `rw_until`
+    READ_YOUR_WRITES_SECONDS: float = 5
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER: bool = False
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    USER_CACHE_MAX_SIZE: int = 1024
+    # Principal de tokens só com `sub`: como em TOKEN_VERSION_TTL_SECONDS, `invalidate_user` só limpa o
+    # próprio worker, e nos demais um usuário desativado ou que perdeu admin mantém o acesso por até este tempo.
+    USER_CACHE_TTL_SECONDS: float = 5
+    ACCESS_TOKEN_CLAIMS: bool = True
+    # `invalidate_user` só limpa o cache do próprio worker: nos demais, um token revogado (troca de senha,
+    # desativação, perda de admin) continua aceito por até este tempo. Menor = revogação mais rápida,
+    # ao custo de uma consulta por chave primária por usuário a cada intervalo, em cada worker.
+    TOKEN_VERSION_TTL_SECONDS: float = 5
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    STREAM_YIELD_PER: int = 500
+    PRODUCT_IMPORT_BATCH_SIZE: int = 1000
+    PRODUCT_CACHE_MAX_SIZE: int = 5000
+    PRODUCT_LIST_CACHE_MAX_SIZE: int = 500
+    PRODUCT_CACHE_TTL_SECONDS: float = 30
+    FAST_JSON_RESPONSES: bool = False
+    TOTAL_COUNT_EXACT_LIMIT: int = 10000
+    BATCH_MAX_IDS: int = 200
+    METRICS_ENABLED: bool = True
+    DB_ECHO: bool = False
+    DB_SLOW_QUERY_MS: float = 0
+    DB_QUERY_LOG_SAMPLE_RATE: float = 0
+    DB_N_PLUS_ONE_THRESHOLD: int = 0
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_AUTH_LIMIT: int = 8
+    ADMISSION_LIST_LIMIT: int = 16
+    ADMISSION_DEFAULT_LIMIT: int = 64
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 1
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -1,13 +1,73 @@
+from typing import Any, Dict
+from uuid import uuid4
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship # relationship usado p/ importar em models
 from app.core.config import settings
+from app.core.pool import InstrumentedQueuePool
+from app.core.query_log import instrument_engine
 
-Base = declarative_base()
+class ModelDefaults:
+    # defaults do servidor (created_at/updated_at) voltam no próprio INSERT/UPDATE via RETURNING,
+    # dispensando o refresh (SELECT extra) depois de cada commit
+    __mapper_args__ = {"eager_defaults": True}
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+Base = declarative_base(cls=ModelDefaults)
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Parâmetros do `create_async_engine` a partir do `Settings` (pool, pre-ping, cache de statements).
+    SQLite em memória mantém o pool padrão (`StaticPool`), que não aceita esses parâmetros.
+    """
+    url = make_url(database_url)
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO, "future": True}
+
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+    if url.get_driver_name() == "asyncpg":
+        if settings.DB_PGBOUNCER:
+            # PgBouncer (modo transaction) não mantém prepared statements entre transações
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            options["connect_args"] = {
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            }
+
+    return options
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+instrument_engine(engine.sync_engine)
 
 async_session_maker = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+# réplica de leitura opcional (ver app/core/replica.py)
+replica_engine = (
+    create_async_engine(settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL))
+    if settings.DATABASE_REPLICA_URL else None
+)
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine)
+
+replica_session_maker = (
+    sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None else None
+)
+
 async def session_db():
     async with async_session_maker() as session:
         yield session
\ No newline at end of file
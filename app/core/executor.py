@@ -0,0 +1,48 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, TypeVar
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+
+class BoundedExecutor:
+    """
+    Pool de threads de tamanho fixo para tarefas bloqueantes (ex: bcrypt), com fila limitada.
+
+    - No máximo `max_workers` tarefas executam ao mesmo tempo.
+    - No máximo `max_queue` tarefas ficam aguardando; além disso responde 503 com `Retry-After`.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.name = name
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, tente novamente em instantes.",
+                headers={"Retry-After": "1"}
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(fn, *args))
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
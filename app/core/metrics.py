@@ -0,0 +1,154 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in self.values.items()]
+        return lines
+
+class Gauge(Counter):
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help, tuple(labels), tuple(buckets)
+        # por conjunto de labels: [contagem por bucket (não acumulada) + "+Inf", soma]
+        self.values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total[0]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+http_requests = Counter("http_requests_total", "Requisições HTTP atendidas.", ("method", "route", "status"))
+http_in_flight = Gauge("http_requests_in_flight", "Requisições HTTP em andamento.")
+http_latency = Histogram("http_request_duration_seconds", "Latência das requisições HTTP.", ("method", "route", "status"))
+request_queries = Histogram("http_request_db_queries", "Consultas ao banco por requisição.", ("method", "route"), QUERY_COUNT_BUCKETS)
+request_db_time = Histogram("http_request_db_seconds", "Tempo no banco por requisição.", ("method", "route"))
+db_queries = Counter("db_queries_total", "Consultas executadas no banco (todas as origens).")
+db_time = Counter("db_query_seconds_total", "Tempo total gasto em consultas ao banco.")
+
+REGISTRY = (http_requests, http_in_flight, http_latency, request_queries, request_db_time, db_queries, db_time)
+
+def render_metrics() -> str:
+    """Todas as métricas no formato texto do Prometheus (`text/plain; version=0.0.4`)."""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# [consultas, segundos] da requisição atual; a lista é mutável para os eventos do engine somarem nela
+request_db: ContextVar[Optional[List[float]]] = ContextVar("request_db", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+
+    elapsed = perf_counter() - started.pop()
+    db_queries.inc()
+    db_time.inc(amount=elapsed)
+
+    stats = request_db.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
+
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+if settings.METRICS_ENABLED:
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro (sem `BaseHTTPMiddleware`, que enfileira o corpo da resposta).
+
+    - Rotula pelo template da rota (`/orders/{id}`), nunca pelo caminho real, para limitar a cardinalidade;
+      requisições sem rota correspondente ficam em `route="<unmatched>"`.
+    - A latência cobre até o fim do envio do corpo (inclui respostas em streaming).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        stats = [0, 0.0]
+        token = request_db.set(stats)
+        http_in_flight.inc()
+        start = perf_counter()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - start
+            http_in_flight.dec()
+            request_db.reset(token)
+
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "<unmatched>"))
+            http_requests.inc((*labels, status[0]))
+            http_latency.observe(elapsed, (*labels, status[0]))
+            request_queries.observe(stats[0], labels)
+            request_db_time.observe(stats[1], labels)
@@ -0,0 +1,56 @@
+from time import perf_counter
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` que mede quanto tempo cada checkout esperou por uma conexão
+    (inclui abrir conexões de overflow) e quantos estouraram `pool_timeout`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = perf_counter() - start
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """Estado atual do pool do engine: conexões livres/em uso/overflow e tempos de espera."""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "timeout": pool.timeout(),
+        })
+
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "wait_avg_ms": round(pool.wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "wait_max_ms": round(pool.wait_max * 1000, 3),
+        })
+
+    return stats
@@ -0,0 +1,98 @@
+import logging
+import random
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger("app.db")
+
+MAX_STATEMENT_LENGTH = 1000
+
+# comandos executados na requisição atual (só existe com a detecção de N+1 ligada)
+request_statements: ContextVar[Optional[Counter]] = ContextVar("request_statements", default=None)
+
+def enabled() -> bool:
+    return settings.DB_SLOW_QUERY_MS > 0 or settings.DB_QUERY_LOG_SAMPLE_RATE > 0 or settings.DB_N_PLUS_ONE_THRESHOLD > 0
+
+def redact(parameters: Any, executemany: bool) -> str:
+    """Mostra só os tipos dos parâmetros (nunca os valores: podem ser senhas, e-mails, CPFs...)."""
+    if executemany:
+        return f"<{len(parameters)} linhas>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: <{type(value).__name__}>" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(f"<{type(value).__name__}>" for value in parameters) + ")"
+    return "()"
+
+def _short(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= MAX_STATEMENT_LENGTH else statement[:MAX_STATEMENT_LENGTH] + "..."
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_log_started", []).append(perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_log_started")
+    if not started:
+        return
+
+    elapsed_ms = (perf_counter() - started.pop()) * 1000
+
+    if 0 < settings.DB_SLOW_QUERY_MS <= elapsed_ms:
+        logger.warning("consulta lenta (%.1f ms): %s %s", elapsed_ms, _short(statement), redact(parameters, executemany))
+    elif settings.DB_QUERY_LOG_SAMPLE_RATE > 0 and random.random() < settings.DB_QUERY_LOG_SAMPLE_RATE:
+        logger.info("consulta (%.1f ms): %s %s", elapsed_ms, _short(statement), redact(parameters, executemany))
+
+    statements = request_statements.get()
+    if statements is not None:
+        statements[statement] += 1
+
+def _handle_error(context):
+    started = context.connection.info.get("query_log_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Liga o log de consultas lentas/amostradas e a contagem para N+1 no engine.
+
+    Com `DB_SLOW_QUERY_MS`, `DB_QUERY_LOG_SAMPLE_RATE` e `DB_N_PLUS_ONE_THRESHOLD` zerados,
+    nenhum evento é registrado (custo zero por consulta).
+    """
+    if not enabled():
+        return
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class NPlusOneMiddleware:
+    """
+    Ao fim de cada requisição, avisa sobre comandos idênticos (mesmo SQL, parâmetros diferentes)
+    repetidos `DB_N_PLUS_ONE_THRESHOLD` vezes ou mais: sinal típico de lazy load em laço (N+1).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        statements = Counter()
+        token = request_statements.set(statements)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_statements.reset(token)
+
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for statement, count in statements.items():
+                if count >= settings.DB_N_PLUS_ONE_THRESHOLD:
+                    logger.warning("possível N+1 em %s %s: %d execuções de %s", scope["method"], route, count, _short(statement))
@@ -0,0 +1,132 @@
+import math
+from contextvars import ContextVar
+from time import time
+from typing import Any, Dict, Optional
+from fastapi import Depends, Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import async_session_maker, replica_engine, replica_session_maker, session_db
+from app.core.security import Principal, locked_route
+
+# Usuários que gravaram algo recentemente leem do primário até a réplica alcançá-los.
+# Este cache é por processo: com vários workers, quem garante o read-your-writes é o cookie
+# `READ_YOUR_WRITES_COOKIE` (ver `ReadYourWritesMiddleware`), que acompanha o cliente.
+recent_writers = TTLCache(maxsize=10_000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+READ_YOUR_WRITES_COOKIE = "rw_until"
+
+# commits da requisição atual (preenchido pelo `after_commit`, lido pelo middleware)
+request_writes: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_writes", default=None)
+
+# último atraso medido da réplica (em segundos); None = réplica indisponível
+_replica_lag = TTLCache(maxsize=1, ttl=settings.REPLICA_LAG_CHECK_SECONDS)
+
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+@event.listens_for(Session, "after_commit")
+def _track_writer(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        recent_writers.set(user_id, True)
+
+        writes = request_writes.get()
+        if writes is not None:
+            writes["committed"] = True
+
+
+def wrote_recently(request: Request, user_id: int) -> bool:
+    """Se o cliente gravou há menos de `READ_YOUR_WRITES_SECONDS`, em qualquer worker (cookie) ou neste (cache)."""
+    try:
+        if float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time():
+            return True
+    except ValueError:
+        pass
+    return bool(recent_writers.get(user_id))
+
+
+async def replica_lag() -> Optional[float]:
+    cached = _replica_lag.get("lag")
+    if cached is not None:
+        return cached[0]
+
+    try:
+        async with replica_engine.connect() as conn:
+            lag = float((await conn.execute(REPLICA_LAG_QUERY)).scalar() or 0) if replica_engine.dialect.name == "postgresql" else 0.0
+    except Exception:
+        lag = None
+
+    _replica_lag.set("lag", (lag,))
+    return lag
+
+
+async def read_session_maker(request: Request, user: Principal = Depends(locked_route)) -> sessionmaker:
+    """
+    Escolhe de onde a requisição lê:
+    - primário, se não há réplica, se o usuário gravou há menos de `READ_YOUR_WRITES_SECONDS`,
+      ou se a réplica está indisponível/atrasada mais que `REPLICA_MAX_LAG_SECONDS`;
+    - réplica, caso contrário.
+    """
+    if replica_session_maker is None or wrote_recently(request, user.id):
+        return async_session_maker
+
+    lag = await replica_lag()
+    if lag is None or lag > settings.REPLICA_MAX_LAG_SECONDS:
+        return async_session_maker
+
+    return replica_session_maker
+
+
+async def session_db_read(
+    primary: AsyncSession = Depends(session_db),
+    maker: sessionmaker = Depends(read_session_maker),
+):
+    """Sessão somente leitura para rotas GET; usa a mesma sessão do primário quando não vai à réplica."""
+    if maker is async_session_maker:
+        yield primary
+        return
+
+    async with maker() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """
+    Responde com o cookie `READ_YOUR_WRITES_COOKIE` (instante até quando ler do primário) nas
+    requisições que gravaram algo, para que o próximo GET do cliente, em qualquer worker,
+    não leia da réplica atrasada. Só é registrado quando há `DATABASE_REPLICA_URL`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        writes: Dict[str, Any] = {"committed": False}
+        token = request_writes.set(writes)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and writes["committed"]:
+                max_age = math.ceil(settings.READ_YOUR_WRITES_SECONDS)
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={time() + settings.READ_YOUR_WRITES_SECONDS:.3f}; "
+                    f"Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            request_writes.reset(token)
@@ -1,15 +1,47 @@
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.models.users import UserModel
 from app.repositories.users import UserRepository
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import session_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-async def locked_route(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(session_db)):
+@dataclass(frozen=True)
+class Principal:
+    """Usuário autenticado: só o necessário para autorizar a requisição, sem carregar o `UserModel`."""
+    id: int
+    is_admin: bool
+    is_active: bool
+
+# Usuários de tokens sem claims (só `sub`), por ID, para não consultar o banco a cada rota protegida.
+# Cache por processo: em outros workers, desativação/perda de admin vale após no máximo `USER_CACHE_TTL_SECONDS`.
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+# Versão atual dos tokens de cada usuário; tokens com claims só são válidos na versão corrente.
+# Cache por processo: em outros workers a revogação vale após no máximo `TOKEN_VERSION_TTL_SECONDS`.
+token_versions = TTLCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.TOKEN_VERSION_TTL_SECONDS)
+
+def invalidate_user(user_id: int) -> None:
+    """Chamado quando o usuário muda ou é removido (a versão dos tokens já foi incrementada no banco)."""
+    user_cache.invalidate(user_id)
+    token_versions.invalidate(user_id)
+
+async def current_token_version(user_id: int, db: AsyncSession) -> Optional[int]:
+    version = token_versions.get(user_id)
+
+    if version is None:
+        version = await UserRepository(db).get_token_version(user_id)
+        if version is not None:
+            token_versions.set(user_id, version)
+
+    return version
+
+async def locked_route(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(session_db)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED, 
         detail="Não autenticado.", 
@@ -28,15 +60,33 @@ async def locked_route(token: str = Depends(oauth2_scheme), db: AsyncSession = D
     except JWTError:
         raise credentials_exception
 
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
-    
-    if user is None:
-        raise credentials_exception
-    
+    # usado para rotear leituras (read-your-writes) em app/core/replica.py
+    db.info["user_id"] = user_id
+
+    if "ver" in payload:
+        # token com claims: o banco só é consultado quando a versão não está em cache
+        if await current_token_version(user_id, db) != payload["ver"]:
+            raise credentials_exception
+
+        user = Principal(user_id, bool(payload.get("is_admin")), bool(payload.get("is_active")))
+    else:
+        user = user_cache.get(user_id)
+
+        if user is None:
+            model = await UserRepository(db).get_by_id(user_id)
+
+            if model is None:
+                raise credentials_exception
+
+            user = Principal(model.id, model.is_admin, model.is_active)
+            user_cache.set(user_id, user)
+
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuário desativado.")
+
     return user
 
-def require_admin(user: UserModel = Depends(locked_route)):
+def require_admin(user: Principal = Depends(locked_route)) -> Principal:
     if not user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Ação restrita a administradores.")
     return user
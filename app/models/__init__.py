@@ -2,4 +2,5 @@ from .users import UserModel
 from .orders import OrderModel
 from .clients import ClientModel
 from .products import ProductModel
-from .order_products import OrderProductsModel
\ No newline at end of file
+from .order_products import OrderProductsModel
+from .sales_daily import SalesDailyModel
\ No newline at end of file
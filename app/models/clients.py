@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import DDL, Column, Index, Integer, String, Text, DateTime, event, func
 from app.core.database import Base, relationship
 
 class ClientModel(Base):
@@ -14,4 +14,35 @@ class ClientModel(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    orders = relationship("OrderModel", back_populates="client")
\ No newline at end of file
+    orders = relationship("OrderModel", back_populates="client")
+
+    __table_args__ = (
+        # paginação por cursor: ORDER BY name, id
+        Index("ix_clients_name_id", "name", "id"),
+    )
+
+# Busca aproximada (`q`): índices GIN pg_trgm no PostgreSQL e tabela FTS5 (trigram) no SQLite.
+# As migrações criam o mesmo; estes eventos cobrem bancos criados via `create_all` (ex: testes).
+SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_clients_name_trgm ON clients USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_clients_email_trgm ON clients USING gin (email gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(name, email, content='clients', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS clients_fts_ai AFTER INSERT ON clients BEGIN "
+        "INSERT INTO clients_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END",
+        "CREATE TRIGGER IF NOT EXISTS clients_fts_ad AFTER DELETE ON clients BEGIN "
+        "INSERT INTO clients_fts(clients_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email); END",
+        "CREATE TRIGGER IF NOT EXISTS clients_fts_au AFTER UPDATE ON clients BEGIN "
+        "INSERT INTO clients_fts(clients_fts, rowid, name, email) VALUES ('delete', old.id, old.name, old.email); "
+        "INSERT INTO clients_fts(rowid, name, email) VALUES (new.id, new.name, new.email); END",
+    ],
+}
+
+for dialect, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(ClientModel.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+
+event.listen(ClientModel.__table__, "before_drop", DDL("DROP TABLE IF EXISTS clients_fts").execute_if(dialect="sqlite"))
\ No newline at end of file
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, UniqueConstraint, DateTime, func, text
+from sqlalchemy import Column, Index, Integer, ForeignKey, Numeric, String, UniqueConstraint, DateTime, func, text
 from app.core.database import Base, relationship
 
 class OrderProductsModel(Base):
+    nome = "Item do pedido"
     __tablename__ = 'order_products'
 
     id = Column(Integer, primary_key=True)
@@ -9,11 +10,15 @@ class OrderProductsModel(Base):
     product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
     quantity = Column(Integer, nullable=False, server_default=text("1"))
     price_at_moment = Column(Numeric(10, 2), nullable=False)
+    # seção do produto no momento da venda: chave do item em sales_daily, usada também para estorná-lo
+    section = Column(String(100), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     __table_args__ = (
         UniqueConstraint('order_id', 'product_id', name='uq_order_product'),
+        # EXISTS por produto na listagem de pedidos; buscas por order_id usam uq_order_product
+        Index("ix_order_products_product_id_order_id", "product_id", "order_id"),
     )
 
     order = relationship("OrderModel", back_populates="order_products")
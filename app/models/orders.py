@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Numeric, DateTime, func
+from sqlalchemy import Column, Index, Integer, ForeignKey, String, Numeric, DateTime, func
 from app.core.database import Base, relationship
 
 class OrderModel(Base):
@@ -6,13 +6,19 @@ class OrderModel(Base):
     __tablename__ = 'orders'
     
     id = Column(Integer, primary_key=True)
-    client_id = Column(Integer, ForeignKey("clients.id"), index=True, nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
-    status = Column(String(20), index=True, nullable=False)
+    status = Column(String(20), nullable=False)
     total_amount = Column(Numeric(10, 2), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     user = relationship("UserModel", back_populates="orders")
     client = relationship("ClientModel", back_populates="orders")
-    order_products = relationship("OrderProductsModel", back_populates="order")
+    order_products = relationship("OrderProductsModel", back_populates="order", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # filtros da listagem por cliente/status com intervalo de datas (também cobrem o filtro só por client_id/status)
+        Index("ix_orders_client_id_created_at", "client_id", "created_at"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, Date, DateTime, func, text
+from sqlalchemy import Column, Index, Integer, String, Text, Numeric, Date, DateTime, func, text
 from app.core.database import Base
 
 class ProductModel(Base):
@@ -16,3 +16,8 @@ class ProductModel(Base):
     image_url = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # paginação por cursor: ORDER BY name, id
+        Index("ix_products_name_id", "name", "id"),
+    )
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, func, text
+from app.core.database import Base
+
+class SalesDailyModel(Base):
+    """
+    Resumo de vendas por (dia, seção, produto), mantido incrementalmente pelos serviços de pedidos/itens.
+
+    - `day`: data (UTC) de criação do pedido.
+    - `section`: seção do produto no momento da venda (`''` quando o produto não tem seção).
+    """
+    __tablename__ = "sales_daily"
+
+    day = Column(Date, primary_key=True)
+    section = Column(String(100), primary_key=True, server_default=text("''"))
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    quantity = Column(Integer, nullable=False, server_default=text("0"))
+    revenue = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
+    order_lines = Column(Integer, nullable=False, server_default=text("0"))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # relatórios filtrando por seção/produto num intervalo de dias
+        Index("ix_sales_daily_section_day", "section", "day"),
+        Index("ix_sales_daily_product_day", "product_id", "day"),
+    )
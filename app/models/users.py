@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, text
 from app.core.database import Base, relationship
 
 class UserModel(Base):
+    nome = "Usuário"
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True)
@@ -10,6 +11,8 @@ class UserModel(Base):
     hashed_password = Column(String(256), nullable=False)
     is_active = Column(Boolean, nullable=False, server_default=text("true"))
     is_admin = Column(Boolean, nullable=False, server_default=text("false"))
+    # incrementada a cada alteração/troca de senha: invalida os tokens já emitidos
+    token_version = Column(Integer, nullable=False, server_default=text("0"))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
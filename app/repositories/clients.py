@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.clients import ClientModel
+from sqlalchemy import case, column, func, literal, literal_column, or_, table, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 from pydantic import EmailStr
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from app.core.config import settings
 from app.schemas.clients import ClientUpdateSchema, CreateClientSchema
+from app.utils.total_count import total_count
  
 class ClientRepository:
     def __init__(self, session: AsyncSession):
@@ -16,6 +20,12 @@ class ClientRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, ids: List[int]) -> List[ClientModel]:
+        result = await self.session.execute(
+            select(ClientModel).where(ClientModel.id.in_(ids))
+        )
+        return result.scalars().all()
+
     async def get_by_field(self, field: str, value: Any):
         
         result = await self.session.execute(
@@ -23,30 +33,94 @@ class ClientRepository:
         )
         
         return result.scalar_one_or_none()
+
+    async def get_conflicts(self, values: Dict[str, Any]) -> List[str]:
+        """Retorna, em uma única consulta, as colunas de `values` cujo valor já está cadastrado."""
+        values = {field: value for field, value in values.items() if value is not None}
+
+        if not values:
+            return []
+
+        matches = [getattr(ClientModel, field) == value for field, value in values.items()]
+        result = await self.session.execute(
+            select(*(func.max(case((match, 1), else_=0)).label(field) for field, match in zip(values, matches)))
+            .where(or_(*matches))
+        )
+        row = result.one()._mapping
+        return [field for field in values if row[field]]
     
-    async def list(self, name: Optional[str] = None, email: Optional[str] = None, limit: int = 10,offset: int = 0) -> List[ClientModel]:
+    def _filtered(self, name: Optional[str] = None, email: Optional[str] = None):
         query = select(ClientModel)
 
         if name:
             query = query.where(ClientModel.name.ilike(f"%{name}%"))
         if email:
             query = query.where(ClientModel.email.ilike(f"%{email}%"))
-            
-        query = query.offset(offset).limit(limit)
+
+        return query
+
+    async def count(self, name: Optional[str] = None, email: Optional[str] = None) -> Tuple[int, bool]:
+        return await total_count(self.session, self._filtered(name, email), settings.TOTAL_COUNT_EXACT_LIMIT)
+
+    async def list(self, name: Optional[str] = None, email: Optional[str] = None, limit: int = 10,offset: int = 0) -> List[ClientModel]:
+        query = self._filtered(name, email).offset(offset).limit(limit)
         result = await self.session.execute(query)
         return result.scalars().all()
+
+    async def list_after(self, name: Optional[str] = None, email: Optional[str] = None, limit: int = 10, after: Optional[Tuple[str, int]] = None) -> List[ClientModel]:
+        """Paginação por cursor (keyset) em (name, id); retorna até `limit` registros após `after`."""
+        query = self._filtered(name, email).order_by(ClientModel.name, ClientModel.id)
+
+        if after is not None:
+            query = query.where(tuple_(ClientModel.name, ClientModel.id) > tuple_(*after))
+
+        result = await self.session.execute(query.limit(limit))
+        return result.scalars().all()
+    
+    async def search(self, q: str, name: Optional[str] = None, email: Optional[str] = None, limit: int = 10, offset: int = 0) -> List[ClientModel]:
+        """
+        Busca aproximada por nome/e-mail, ordenada por relevância e tolerante a erros de digitação.
+        - PostgreSQL: `word_similarity` (pg_trgm), servida pelos índices GIN.
+        - SQLite: FTS5 com tokenizer trigram, ranqueado por `bm25`.
+        """
+        query = self._filtered(name, email)
+
+        if self.session.bind.dialect.name == "postgresql":
+            score = func.greatest(func.word_similarity(q, ClientModel.name), func.word_similarity(q, ClientModel.email))
+            query = query.where(or_(literal(q).op("<%")(ClientModel.name), literal(q).op("<%")(ClientModel.email)))
+            query = query.order_by(score.desc(), ClientModel.id)
+        else:
+            text = q.lower()
+            trigrams = dict.fromkeys(text[i:i + 3] for i in range(len(text) - 2))
+
+            if not trigrams:
+                # termos com menos de 3 caracteres não geram trigramas
+                query = query.where(or_(ClientModel.name.ilike(f"{q}%"), ClientModel.email.ilike(f"{q}%"))).order_by(ClientModel.name, ClientModel.id)
+            else:
+                fts = table("clients_fts", column("rowid"))
+                match = " OR ".join('"' + trigram.replace('"', '""') + '"' for trigram in trigrams)
+                query = (
+                    query.join(fts, fts.c.rowid == ClientModel.id)
+                    .where(literal_column("clients_fts").op("MATCH")(match))
+                    .order_by(func.bm25(literal_column("clients_fts")), ClientModel.id)
+                )
+
+        result = await self.session.execute(query.offset(offset).limit(limit))
+        return result.scalars().all()
     
     async def create(self, data: CreateClientSchema) -> ClientModel:
         self.session.add(data)
-        await self.session.commit()
-        await self.session.refresh(data)
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise
         return data
     
     async def update(self, base_data: ClientModel, update_data: ClientUpdateSchema) -> ClientModel:
         for key, value in update_data.model_dump(exclude_unset=True).items():
             setattr(base_data, key, value)
         await self.session.commit()
-        await self.session.refresh(base_data)
         return base_data
     
     async def delete(self, data: ClientModel) -> None:
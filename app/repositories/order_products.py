@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.models.order_products import OrderProductsModel
+from app.core.config import settings
 from app.schemas.order_products import OrderProductsDetailsSchema, OrderProductsSchema, OrderProductsUpdateSchema
+from app.utils.total_count import total_count
 
 class OrderProductsRepository:
     def __init__(self, session: AsyncSession):
@@ -24,7 +26,7 @@ class OrderProductsRepository:
         )
         return result.scalar_one_or_none()
 
-    async def list(self,
+    def _filtered(self,
         order_id: Optional[int] = None,
         product_id: Optional[int] = None,
         quantity: Optional[int] = None,
@@ -32,7 +34,7 @@ class OrderProductsRepository:
         price_at_moment_max: Optional[int] = None,
         date_start: Optional[datetime] = None, 
         date_end: Optional[datetime] = None,
-    ) -> list[OrderProductsDetailsSchema]:
+    ):
         query = select(OrderProductsModel)
 
         if order_id:
@@ -50,13 +52,53 @@ class OrderProductsRepository:
         if date_end is not None:
             query = query.where(OrderProductsModel.created_at <= date_end)
 
-        result = await self.session.execute(query)
+        return query.order_by(OrderProductsModel.id)
+
+    async def count(self,
+        order_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        quantity: Optional[int] = None,
+        price_at_moment_min: Optional[int] = None,
+        price_at_moment_max: Optional[int] = None,
+        date_start: Optional[datetime] = None, 
+        date_end: Optional[datetime] = None,
+    ) -> Tuple[int, bool]:
+        query = self._filtered(order_id, product_id, quantity, price_at_moment_min, price_at_moment_max, date_start, date_end)
+        return await total_count(self.session, query, settings.TOTAL_COUNT_EXACT_LIMIT)
+
+    async def list(self,
+        order_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        quantity: Optional[int] = None,
+        price_at_moment_min: Optional[int] = None,
+        price_at_moment_max: Optional[int] = None,
+        date_start: Optional[datetime] = None, 
+        date_end: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[OrderProductsDetailsSchema]:
+        query = self._filtered(order_id, product_id, quantity, price_at_moment_min, price_at_moment_max, date_start, date_end)
+        result = await self.session.execute(query.offset(offset).limit(limit))
         return result.scalars().all()
 
+    async def stream(self,
+        order_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        quantity: Optional[int] = None,
+        price_at_moment_min: Optional[int] = None,
+        price_at_moment_max: Optional[int] = None,
+        date_start: Optional[datetime] = None, 
+        date_end: Optional[datetime] = None,
+    ) -> AsyncIterator[OrderProductsModel]:
+        """Percorre todos os itens filtrados via cursor do servidor, em lotes de `STREAM_YIELD_PER`."""
+        query = self._filtered(order_id, product_id, quantity, price_at_moment_min, price_at_moment_max, date_start, date_end)
+        result = await self.session.stream_scalars(query.execution_options(yield_per=settings.STREAM_YIELD_PER))
+        async for item in result:
+            yield item
+
     async def create(self, data: OrderProductsSchema) -> OrderProductsSchema:
         self.session.add(data)
         await self.session.commit()
-        await self.session.refresh(data)
         return data
     
     async def update(self, base_data: OrderProductsSchema, update_data: OrderProductsUpdateSchema) -> OrderProductsSchema:
@@ -64,7 +106,6 @@ class OrderProductsRepository:
             setattr(base_data, key, value)
 
         await self.session.commit()
-        await self.session.refresh(base_data)
         return base_data
 
     async def delete(self, data: OrderProductsSchema) -> None:
@@ -1,35 +1,70 @@
 from datetime import datetime
-from typing import Optional
+from typing import AbstractSet, AsyncIterator, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import exists, select
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.models.products import ProductModel
 from app.models.order_products import OrderProductsModel
 from app.models.orders import OrderModel
+from app.core.config import settings
 from app.schemas.orders import OrderDetailsSchema, OrderSchema, OrderUpdateSchema
+from app.utils.total_count import total_count
 
 class OrderRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_by_id(self, id: int) -> OrderModel:
+    @staticmethod
+    def _expand_options(expand: AbstractSet[str]):
+        """
+        Estratégias de carga para `?expand=`, com número fixo de consultas:
+        - `client`: JOIN na própria consulta (muitos-para-um).
+        - `items`: +1 `SELECT ... WHERE order_id IN (...)` para todos os pedidos da página.
+        - `items.product`: +1 `SELECT ... WHERE id IN (...)` para todos os produtos desses itens.
+        """
+        options = []
+        if "client" in expand:
+            options.append(joinedload(OrderModel.client))
+        if "items.product" in expand:
+            options.append(selectinload(OrderModel.order_products).selectinload(OrderProductsModel.product))
+        elif "items" in expand:
+            options.append(selectinload(OrderModel.order_products))
+        return options
+
+    async def get_by_id(self, id: int, expand: AbstractSet[str] = frozenset()) -> OrderModel:
         result = await self.session.execute(
-            select(OrderModel).where(OrderModel.id == id)
+            select(OrderModel).where(OrderModel.id == id).options(*self._expand_options(expand))
         )
         return result.scalar_one_or_none()
+
+    async def get_by_ids(self, ids: List[int], expand: AbstractSet[str] = frozenset()) -> List[OrderModel]:
+        result = await self.session.execute(
+            select(OrderModel).where(OrderModel.id.in_(ids)).options(*self._expand_options(expand))
+        )
+        return result.unique().scalars().all()
     
-    async def list(self, 
+    def _filtered(self, 
         date_start: Optional[datetime] = None, 
         date_end: Optional[datetime] = None,
         product_id: Optional[int] = None,
         client_id: Optional[int] = None,
         section: Optional[str] = None,
         status: Optional[str] = None, 
-    ) -> list[OrderDetailsSchema]:
+    ):
         query = select(OrderModel)
 
         if product_id or section:
-            query = query.join(OrderModel.order_products).join(OrderProductsModel.product)
+            # semi-join: cada pedido aparece uma vez, e o banco para no primeiro item que casar
+            item = exists().where(OrderProductsModel.order_id == OrderModel.id)
+            if product_id:
+                item = item.where(OrderProductsModel.product_id == product_id)
+            if section:
+                item = item.where(
+                    ProductModel.id == OrderProductsModel.product_id,
+                    ProductModel.section == section
+                )
+            query = query.where(item)
 
         if client_id:
             query = query.where(OrderModel.client_id == client_id)
@@ -39,26 +74,72 @@ class OrderRepository:
             query = query.where(OrderModel.created_at <= date_end)
         if status is not None:
             query = query.where(OrderModel.status == status)
-        if product_id:
-            query = query.where(OrderProductsModel.product_id == product_id)
-        if section:
-            query = query.where(ProductModel.section == section)
 
-        result = await self.session.execute(query)
+        return query.order_by(OrderModel.id)
+
+    async def count(self, 
+        date_start: Optional[datetime] = None, 
+        date_end: Optional[datetime] = None,
+        product_id: Optional[int] = None,
+        client_id: Optional[int] = None,
+        section: Optional[str] = None,
+        status: Optional[str] = None, 
+    ) -> Tuple[int, bool]:
+        query = self._filtered(date_start, date_end, product_id, client_id, section, status)
+        return await total_count(self.session, query, settings.TOTAL_COUNT_EXACT_LIMIT)
+
+    async def list(self, 
+        date_start: Optional[datetime] = None, 
+        date_end: Optional[datetime] = None,
+        product_id: Optional[int] = None,
+        client_id: Optional[int] = None,
+        section: Optional[str] = None,
+        status: Optional[str] = None, 
+        limit: int = 100,
+        offset: int = 0,
+        expand: AbstractSet[str] = frozenset(),
+    ) -> list[OrderDetailsSchema]:
+        query = self._filtered(date_start, date_end, product_id, client_id, section, status)
+        result = await self.session.execute(query.offset(offset).limit(limit).options(*self._expand_options(expand)))
         return result.scalars().all()
 
+    async def stream(self, 
+        date_start: Optional[datetime] = None, 
+        date_end: Optional[datetime] = None,
+        product_id: Optional[int] = None,
+        client_id: Optional[int] = None,
+        section: Optional[str] = None,
+        status: Optional[str] = None, 
+    ) -> AsyncIterator[OrderModel]:
+        """Percorre todos os pedidos filtrados via cursor do servidor, em lotes de `STREAM_YIELD_PER`."""
+        query = self._filtered(date_start, date_end, product_id, client_id, section, status)
+        result = await self.session.stream_scalars(query.execution_options(yield_per=settings.STREAM_YIELD_PER))
+        async for order in result:
+            yield order
+
     async def create(self, data: OrderSchema) -> OrderModel:
         self.session.add(data)
         await self.session.commit()
-        await self.session.refresh(data)
         return data
     
+    async def add_with_items(self, data: OrderModel, items: List[OrderProductsModel]) -> OrderModel:
+        """
+        Insere o pedido e seus itens sem commit (o RETURNING já traz `created_at`),
+        para o serviço gravar o resumo de vendas na mesma transação antes de `commit()`.
+        """
+        data.order_products = items
+        self.session.add(data)
+        await self.session.flush()
+        return data
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
     async def update(self, base_data: OrderModel, update_data: OrderUpdateSchema) -> OrderModel:
         for key, value in update_data.model_dump(exclude_unset=True).items():
             setattr(base_data, key, value)
 
         await self.session.commit()
-        await self.session.refresh(base_data)
         return base_data
 
     async def delete(self, data: OrderSchema) -> None:
@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from typing import Any, Dict, List, Optional, Tuple
 from decimal import Decimal
 
+from app.core.config import settings
 from app.models.products import ProductModel
 from app.schemas.products import ProductSchema, ProductUpdateSchema
+from app.utils.total_count import total_count
  
 class ProductRepository:
     def __init__(self, session: AsyncSession):
@@ -16,22 +20,63 @@ class ProductRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_by_ids(self, ids: List[int]) -> List[ProductModel]:
+        result = await self.session.execute(
+            select(ProductModel).where(ProductModel.id.in_(ids))
+        )
+        return result.scalars().all()
+
     async def get_by_barcode(self, barcode: str):
         result = await self.session.execute(
             select(ProductModel).where(ProductModel.barcode == barcode)
         )
         return result.scalar_one_or_none()
     
+    async def change_stock(self, id: int, delta: int) -> Optional[int]:
+        """
+        Soma `delta` ao estoque num único `UPDATE ... WHERE stock >= -delta RETURNING stock`, sem commit.
+
+        A condição e a escrita acontecem atomicamente no banco (sem ler antes), então pedidos
+        concorrentes nunca vendem além do estoque. Retorna o novo estoque, ou `None` se não houver saldo.
+        """
+        result = await self.session.execute(
+            update(ProductModel)
+            .where(ProductModel.id == id, ProductModel.stock >= -delta)
+            .values(stock=ProductModel.stock + delta)
+            .returning(ProductModel.stock)
+        )
+        return result.scalar_one_or_none()
+
+    async def upsert_many(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insere os produtos em lote com `INSERT ... ON CONFLICT (barcode) DO UPDATE`, em um único commit.
+        Produtos sem barcode são sempre inseridos (NULL não conflita). Se o banco recusar o lote, nada
+        é gravado: a transação é desfeita e o `DBAPIError` repassado.
+        """
+        insert = postgresql.insert if self.session.bind.dialect.name == "postgresql" else sqlite.insert
+        # Core (tabela) em vez do ORM: mantém todas as linhas em um único executemany
+        stmt = insert(ProductModel.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductModel.barcode],
+            set_={
+                **{column: stmt.excluded[column] for column in rows[0] if column != "barcode"},
+                "updated_at": func.now(),
+            }
+        )
+        try:
+            await self.session.execute(stmt, rows)
+            await self.session.commit()
+        except DBAPIError:
+            await self.session.rollback()
+            raise
+
     async def create(self, data: ProductSchema) -> ProductModel:
         self.session.add(data)
         await self.session.commit()
-        await self.session.refresh(data)
         return data
     
-    async def list(
+    def _filtered(
         self,
-        limit: int,
-        offset: int,
         section: Optional[str] = None,
         price_min: Optional[Decimal] = None,
         price_max: Optional[Decimal] = None,
@@ -51,16 +96,54 @@ class ProductRepository:
             else:
                 query = query.where(ProductModel.stock <= 0)
 
-        query = query.offset(offset).limit(limit)
+        return query
+
+    async def count(
+        self,
+        section: Optional[str] = None,
+        price_min: Optional[Decimal] = None,
+        price_max: Optional[Decimal] = None,
+        availability: Optional[bool] = None
+    ) -> Tuple[int, bool]:
+        query = self._filtered(section, price_min, price_max, availability)
+        return await total_count(self.session, query, settings.TOTAL_COUNT_EXACT_LIMIT)
+
+    async def list(
+        self,
+        limit: int,
+        offset: int,
+        section: Optional[str] = None,
+        price_min: Optional[Decimal] = None,
+        price_max: Optional[Decimal] = None,
+        availability: Optional[bool] = None
+    ):
+        query = self._filtered(section, price_min, price_max, availability).offset(offset).limit(limit)
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def list_after(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, int]] = None,
+        section: Optional[str] = None,
+        price_min: Optional[Decimal] = None,
+        price_max: Optional[Decimal] = None,
+        availability: Optional[bool] = None
+    ):
+        """Paginação por cursor (keyset) em (name, id); retorna até `limit` registros após `after`."""
+        query = self._filtered(section, price_min, price_max, availability).order_by(ProductModel.name, ProductModel.id)
+
+        if after is not None:
+            query = query.where(tuple_(ProductModel.name, ProductModel.id) > tuple_(*after))
+
+        result = await self.session.execute(query.limit(limit))
+        return result.scalars().all()
+
     async def update(self, base_data: ProductModel, update_data: ProductUpdateSchema) -> ProductModel:
         for key, value in update_data.model_dump(exclude_unset=True).items():
             setattr(base_data, key, value)
 
         await self.session.commit()
-        await self.session.refresh(base_data)
 
         return base_data
     
@@ -0,0 +1,89 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.sales_daily import SalesDailyModel
+
+def sales_day(created_at: Optional[datetime]) -> date:
+    """Dia (UTC) em que o pedido entra no resumo; datas sem fuso (SQLite) já estão em UTC."""
+    if created_at is None:
+        return datetime.now(timezone.utc).date()
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+def sales_delta(created_at: Optional[datetime], section: Optional[str], product_id: int, quantity: int, revenue: Decimal, order_lines: int) -> Dict[str, Any]:
+    return {
+        "day": sales_day(created_at),
+        "section": section or "",
+        "product_id": product_id,
+        "quantity": quantity,
+        "revenue": revenue,
+        "order_lines": order_lines,
+    }
+
+class SalesRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record(self, deltas: List[Dict[str, Any]]) -> None:
+        """
+        Soma os deltas (positivos ou negativos) ao resumo com `INSERT ... ON CONFLICT DO UPDATE`.
+
+        Não faz commit: deve ser chamado antes do commit do repositório que grava os itens,
+        para que pedido, itens e resumo fiquem na mesma transação.
+        Cada (day, section, product_id) deve aparecer uma única vez em `deltas`.
+        """
+        if not deltas:
+            return
+
+        insert = postgresql.insert if self.session.bind.dialect.name == "postgresql" else sqlite.insert
+        table = SalesDailyModel.__table__
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.day, table.c.section, table.c.product_id],
+            set_={
+                "quantity": table.c.quantity + stmt.excluded.quantity,
+                "revenue": table.c.revenue + stmt.excluded.revenue,
+                "order_lines": table.c.order_lines + stmt.excluded.order_lines,
+                "updated_at": func.now(),
+            }
+        )
+        await self.session.execute(stmt, deltas)
+
+    async def report(self,
+        date_start: Optional[date] = None,
+        date_end: Optional[date] = None,
+        section: Optional[str] = None,
+        product_id: Optional[int] = None,
+        by_product: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Totais por dia e seção (ou por dia, seção e produto), lidos apenas do resumo."""
+        columns = [SalesDailyModel.day, SalesDailyModel.section]
+        if by_product:
+            columns.append(SalesDailyModel.product_id)
+
+        query = select(
+            *columns,
+            func.sum(SalesDailyModel.quantity).label("quantity"),
+            func.sum(SalesDailyModel.revenue).label("revenue"),
+            func.sum(SalesDailyModel.order_lines).label("order_lines"),
+        )
+
+        if date_start is not None:
+            query = query.where(SalesDailyModel.day >= date_start)
+        if date_end is not None:
+            query = query.where(SalesDailyModel.day <= date_end)
+        if section is not None:
+            query = query.where(SalesDailyModel.section == section)
+        if product_id is not None:
+            query = query.where(SalesDailyModel.product_id == product_id)
+
+        # linhas zeradas (itens removidos) continuam na tabela, mas não aparecem no relatório
+        query = query.group_by(*columns).having(func.sum(SalesDailyModel.order_lines) != 0).order_by(*columns)
+
+        result = await self.session.execute(query)
+        return [dict(row._mapping) for row in result]
@@ -2,7 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import EmailStr
 from sqlalchemy.future import select
 from app.models.users import UserModel
-from app.schemas.users import UserDetailsSchema
+from app.schemas.users import UserUpdateSchema
 class UserRepository: 
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -13,6 +13,12 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_token_version(self, id: int) -> int | None:
+        result = await self.session.execute(
+            select(UserModel.token_version).where(UserModel.id == id)
+        )
+        return result.scalar_one_or_none()
+
     async def get_by_email(self, email: EmailStr) -> UserModel | None:
         result = await self.session.execute(
             select(UserModel).where(UserModel.email == email)
@@ -22,14 +28,13 @@ class UserRepository:
     async def create(self, data: UserModel) -> UserModel:
         self.session.add(data)
         await self.session.commit()
-        await self.session.refresh(data)
         return data
     
-    async def update(self, base_data: UserModel, update_data: UserDetailsSchema) -> UserModel:
-        for key, value in update_data.model_dump(exclude_unset=True).items():
+    async def update(self, base_data: UserModel, update_data: UserUpdateSchema) -> UserModel:
+        for key, value in update_data.model_dump(exclude_unset=True, exclude={"password"}).items():
             setattr(base_data, key, value)
+        base_data.token_version = UserModel.token_version + 1
         await self.session.commit()
-        await self.session.refresh(base_data)
         return base_data
 
     async def delete(self, user: UserModel) -> None:
@@ -1,8 +1,11 @@
 from fastapi import FastAPI
+from app.routes.admin import router as router_admin
+from app.routes.monitoring import router as router_monitoring
 from app.routes.users import router as router_users
 from app.routes.orders import router as router_orders
 from app.routes.clients import router as router_clients
 from app.routes.products import router as router_products
+from app.routes.reports import router as router_reports
 from app.routes.order_products import router as router_order_products
 
 def create_routes(instance_fastapi: FastAPI) -> None:
@@ -15,3 +18,6 @@ def create_routes(instance_fastapi: FastAPI) -> None:
         instance_fastapi.include_router(router_clients)
         instance_fastapi.include_router(router_products)
         instance_fastapi.include_router(router_order_products)
+        instance_fastapi.include_router(router_reports)
+        instance_fastapi.include_router(router_admin)
+        instance_fastapi.include_router(router_monitoring)
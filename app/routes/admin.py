@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, status
+from app.core.database import engine
+from app.core.pool import pool_stats
+from app.core.security import Principal, require_admin, token_versions, user_cache
+from app.services.products import product_cache, product_list_cache
+from app.services.users import password_executor
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/cache/users", status_code=status.HTTP_200_OK)
+async def users_cache_stats(admin: Principal = Depends(require_admin)):
+    return {"users": user_cache.stats(), "token_versions": token_versions.stats()}
+
+
+@router.get("/cache/products", status_code=status.HTTP_200_OK)
+async def products_cache_stats(admin: Principal = Depends(require_admin)):
+    return {"entities": product_cache.stats(), "lists": product_list_cache.stats()}
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def database_pool_stats(admin: Principal = Depends(require_admin)):
+    return pool_stats(engine)
+
+
+@router.get("/executors/password", status_code=status.HTTP_200_OK)
+async def password_executor_stats(admin: Principal = Depends(require_admin)):
+    return password_executor.stats()
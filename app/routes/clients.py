@@ -1,33 +1,66 @@
-from app.models.users import UserModel
-from app.schemas.clients import ClientUpdateSchema, CreateClientSchema, ClientSchema
+from app.schemas.clients import ClientBatchSchema, ClientPageSchema, ClientUpdateSchema, CreateClientSchema, ClientSchema
 from app.repositories.clients import ClientRepository
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.clients import ClientService
-from app.core.security import locked_route, require_admin
+from app.core.security import Principal, locked_route, require_admin
+from app.core.config import settings
 from app.core.database import session_db
-from fastapi import APIRouter, Depends, Query, status
+from app.core.replica import session_db_read
+from fastapi import APIRouter, Depends, Query, Response, status
 from pydantic import EmailStr
-from typing import Optional
+from app.utils.batch import parse_ids
+from app.utils.fast_json import fast_json_response
+from app.utils.total_count import set_total_count
+from typing import List, Optional, Union
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
-def get_service(db: AsyncSession = Depends(session_db), locked: UserModel = Depends(locked_route)) -> ClientService:
+def get_service(db: AsyncSession = Depends(session_db), locked: Principal = Depends(locked_route)) -> ClientService:
+    return ClientService(ClientRepository(db))
+
+def get_read_service(db: AsyncSession = Depends(session_db_read)) -> ClientService:
     return ClientService(ClientRepository(db))
  
 
+# declarada antes de `/{id}`, que também casaria com "/batch"
+@router.get("/batch", status_code=status.HTTP_200_OK, response_model=ClientBatchSchema)
+async def get_by_ids(
+    ids: str = Query(..., description="IDs separados por vírgula (máximo `BATCH_MAX_IDS`)", examples={"exemplo": {"ids": "3,1,2"}}),
+    service: ClientService = Depends(get_read_service)
+):
+    return await service.get_by_ids(parse_ids(ids))
+
+
 @router.get("/{id}", status_code=status.HTTP_200_OK, response_model=ClientSchema)
-async def get_by_id(id: int, service: ClientService = Depends(get_service)):
+async def get_by_id(id: int, service: ClientService = Depends(get_read_service)):
     return await service.get_by_id(id)
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+@router.get("/", status_code=status.HTTP_200_OK, response_model=Union[List[ClientSchema], ClientPageSchema])
 async def list(
+    response: Response,
     name: Optional[str] = Query(None, description="Nome do cliente que deseja filtrar", examples={"exemplo": {"name": "Gustavo"}}),
     email: Optional[EmailStr] = Query(None, description="E-mail do cliente que deseja filtrar", examples={"exemplo": {"email": "11joao44@gmail.com"}}),
-    limit: int = 10, offset: int = 0,
-    service: ClientService = Depends(get_service)
+    limit: int = Query(10, ge=1, le=1000, description="Quantidade máxima de registros por página"),
+    offset: int = Query(0, ge=0, description="Quantidade de registros a pular"),
+    cursor: Optional[str] = Query(None, description="Paginação por cursor: envie vazio na primeira página e depois o `next_cursor` recebido (ignora `offset`)"),
+    q: Optional[str] = Query(None, min_length=1, max_length=128, description="Busca aproximada por nome ou e-mail, tolerante a erros de digitação e ordenada por relevância", examples={"exemplo": {"q": "gustvo"}}),
+    service: ClientService = Depends(get_read_service)
 ):
-    return await service.list(name, email, limit, offset)
+    if q is not None:
+        result = await service.search(q, name, email, limit, offset)
+    elif cursor is not None:
+        result = await service.list_page(name, email, limit, cursor)
+    else:
+        result = await service.list(name, email, limit, offset)
+
+    if settings.FAST_JSON_RESPONSES:
+        result = response = fast_json_response(result, ClientSchema)
+
+    # a busca aproximada não tem total: a relevância só é calculada até `limit`
+    if q is None:
+        set_total_count(response, await service.count(name, email))
+    return result
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=ClientSchema)
@@ -41,5 +74,5 @@ async def update(id: int, data: ClientUpdateSchema,  service: ClientService = De
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete(id: int, service: ClientService = Depends(get_service), admin: UserModel = Depends(require_admin)) -> None:
+async def delete(id: int, service: ClientService = Depends(get_service), admin: Principal = Depends(require_admin)) -> None:
     return await service.delete(id)
\ No newline at end of file
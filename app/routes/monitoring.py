@@ -0,0 +1,61 @@
+import asyncio
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+from app.core.admission import admission_classes, admission_stats
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import render_metrics
+from app.core.pool import pool_stats
+
+router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/health", status_code=status.HTTP_200_OK)
+async def health():
+    """Liveness: o processo está de pé e respondendo (não consulta o banco)."""
+    return {"status": "ok", "admission": admission_stats()}
+
+
+async def ping_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def ready():
+    """
+    Readiness: 503 quando o pool de conexões está esgotado, alguma fila de admissão está cheia
+    ou o banco não responde — o balanceador deve mandar tráfego para outro worker.
+    """
+    pool = pool_stats(engine)
+    reasons = []
+
+    if "size" in pool and pool["checked_out"] >= pool["size"] + settings.DB_MAX_OVERFLOW:
+        reasons.append("pool")
+
+    reasons.extend(f"admission:{name}" for name, admission in admission_classes.items() if admission.saturated)
+
+    if not reasons:
+        try:
+            # o timeout cobre também o checkout do pool (até `pool_timeout`) e a conexão com o banco
+            await asyncio.wait_for(ping_database(), timeout=1)
+        except Exception:
+            reasons.append("database")
+
+    content = {
+        "status": "unavailable" if reasons else "ok",
+        "reasons": reasons,
+        "pool": pool,
+        "admission": admission_stats(),
+    }
+
+    if reasons:
+        return JSONResponse(content, status_code=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": "1"})
+
+    return content
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK, response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,24 +1,31 @@
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
-from app.models.users import UserModel
 from app.core.database import session_db
-from fastapi import APIRouter, Depends, Query, status
+from app.core.replica import read_session_maker, session_db_read
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 from app.repositories.orders import OrderRepository
 from app.repositories.products import ProductRepository
-from app.core.security import locked_route, require_admin
+from app.repositories.sales import SalesRepository
+from app.core.security import Principal, locked_route, require_admin
 from app.schemas.order_products import OrderProductsDetailsSchema, OrderProductsSchema, OrderProductsUpdateSchema
 from app.services.order_products import OrderProductsService
 from app.repositories.order_products import OrderProductsRepository
+from app.utils.ndjson import ndjson_response
+from app.utils.total_count import set_total_count
 
 router = APIRouter(prefix="/order-products", tags=["order-products"])
 
-def get_service(db: AsyncSession = Depends(session_db), locked: UserModel = Depends(locked_route)) -> OrderProductsService:
-    return OrderProductsService(OrderRepository(db), ProductRepository(db), OrderProductsRepository(db))
+def get_service(db: AsyncSession = Depends(session_db), locked: Principal = Depends(locked_route)) -> OrderProductsService:
+    return OrderProductsService(OrderRepository(db), ProductRepository(db), OrderProductsRepository(db), SalesRepository(db))
+
+def get_read_service(db: AsyncSession = Depends(session_db_read)) -> OrderProductsService:
+    return OrderProductsService(OrderRepository(db), ProductRepository(db), OrderProductsRepository(db), SalesRepository(db))
 
 @router.get("/{id}", status_code=status.HTTP_200_OK, response_model=OrderProductsSchema)
-async def get_by_id(id: int, service: OrderProductsService = Depends(get_service)):
+async def get_by_id(id: int, service: OrderProductsService = Depends(get_read_service)):
     return await service.get_by_id(id)
 
 @router.get(
@@ -27,6 +34,7 @@ async def get_by_id(id: int, service: OrderProductsService = Depends(get_service
     response_model=list[OrderProductsDetailsSchema]
 )
 async def list(
+    response: Response,
     order_id: Optional[int] = Query(None,
         description="ID do pedido para filtrar itens",
         examples={"exemplo": {"order_id": 1}}
@@ -61,18 +69,38 @@ async def list(
         description="Data final para filtrar itens (ISO 8601)",
         examples={"exemplo": {"date_end": "2025-01-31T23:59:59"}}
     ),
+
+    limit: int = Query(100, ge=1, le=1000, description="Quantidade máxima de registros por página"),
+
+    offset: int = Query(0, ge=0, description="Quantidade de registros a pular"),
+
+    stream: bool = Query(False, description="Retorna todos os registros filtrados em NDJSON (ignora `limit`/`offset`)"),
     
-    service: OrderProductsService = Depends(get_service)
+    service: OrderProductsService = Depends(get_read_service),
+
+    read_maker: sessionmaker = Depends(read_session_maker)
 ):
-    return await service.list(
+    if stream:
+        return ndjson_response(
+            lambda session: OrderProductsRepository(session).stream(
+                order_id, product_id, quantity, price_at_moment_min, price_at_moment_max, date_start, date_end
+            ),
+            OrderProductsDetailsSchema,
+            read_maker
+        )
+    items = await service.list(
         order_id=order_id,
         product_id=product_id,
         quantity=quantity,
         price_at_moment_min=price_at_moment_min,
         price_at_moment_max=price_at_moment_max,
         date_start=date_start,
-        date_end=date_end
+        date_end=date_end,
+        limit=limit,
+        offset=offset
     )
+    set_total_count(response, await service.count(order_id, product_id, quantity, price_at_moment_min, price_at_moment_max, date_start, date_end))
+    return items
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=OrderProductsSchema)
 async def create(data: OrderProductsSchema, service: OrderProductsService = Depends(get_service)):
@@ -83,5 +111,5 @@ async def update(id: int, data: OrderProductsUpdateSchema, service: OrderProduct
     return await service.update(id, data)
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete(id: int, service: OrderProductsService = Depends(get_service), admin: UserModel = Depends(require_admin)):
+async def delete(id: int, service: OrderProductsService = Depends(get_service), admin: Principal = Depends(require_admin)):
     return await service.delete(id)
\ No newline at end of file
@@ -1,29 +1,59 @@
 from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, Query, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.users import UserModel
+from sqlalchemy.orm import sessionmaker
 from app.repositories.clients import ClientRepository
 from app.repositories.orders import OrderRepository
+from app.repositories.products import ProductRepository
+from app.repositories.sales import SalesRepository
 from app.repositories.users import UserRepository
-from app.services.orders import OrderService
-from app.schemas.orders import OrderDetailsSchema, OrderSchema, OrderUpdateSchema
+from app.services.orders import EXPANDABLE, OrderService, parse_expand
+from app.schemas.orders import OrderBatchSchema, OrderCheckoutSchema, OrderDetailsSchema, OrderExpandedSchema, OrderSchema, OrderUpdateSchema, OrderWithItemsSchema
+from app.core.config import settings
 from app.core.database import session_db
-from app.core.security import locked_route, require_admin
+from app.core.replica import read_session_maker, session_db_read
+from app.core.security import Principal, locked_route, require_admin
+from app.utils.batch import parse_ids
+from app.utils.fast_json import fast_json_response
+from app.utils.ndjson import ndjson_response
+from app.utils.total_count import set_total_count
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
-def get_service(db: AsyncSession = Depends(session_db), locked: UserModel = Depends(locked_route)) -> OrderService:
-    return OrderService(OrderRepository(db), UserRepository(db), ClientRepository(db))
+def get_service(db: AsyncSession = Depends(session_db), locked: Principal = Depends(locked_route)) -> OrderService:
+    return OrderService(OrderRepository(db), UserRepository(db), ClientRepository(db), ProductRepository(db), SalesRepository(db))
 
+def get_read_service(db: AsyncSession = Depends(session_db_read)) -> OrderService:
+    return OrderService(OrderRepository(db), UserRepository(db), ClientRepository(db), ProductRepository(db), SalesRepository(db))
 
-@router.get("/{id}", status_code=status.HTTP_200_OK, response_model=OrderDetailsSchema)
-async def get_by_id(id: int, service: OrderService = Depends(get_service)):
-    return await service.get_by_id(id)
 
+EXPAND_DESCRIPTION = f"Relações a incluir na resposta, separadas por vírgula: {', '.join(EXPANDABLE)}"
 
-@router.get("/", status_code=status.HTTP_200_OK, response_model=list[OrderDetailsSchema])
+
+# declarada antes de `/{id}`, que também casaria com "/batch"
+@router.get("/batch", status_code=status.HTTP_200_OK, response_model=OrderBatchSchema, response_model_exclude_unset=True)
+async def get_by_ids(
+    ids: str = Query(..., description="IDs separados por vírgula (máximo `BATCH_MAX_IDS`)", examples={"exemplo": {"ids": "3,1,2"}}),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION, examples={"exemplo": {"expand": "items.product,client"}}),
+    service: OrderService = Depends(get_read_service)
+):
+    return await service.get_by_ids(parse_ids(ids), parse_expand(expand))
+
+
+@router.get("/{id}", status_code=status.HTTP_200_OK, response_model=OrderExpandedSchema, response_model_exclude_unset=True)
+async def get_by_id(
+    id: int,
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION, examples={"exemplo": {"expand": "items.product,client"}}),
+    service: OrderService = Depends(get_read_service)
+):
+    expand = parse_expand(expand)
+    return OrderExpandedSchema.from_order(await service.get_by_id(id, expand), expand)
+
+
+@router.get("/", status_code=status.HTTP_200_OK, response_model=List[OrderExpandedSchema], response_model_exclude_unset=True)
 async def list(
+    response: Response,
     date_start:  Optional[datetime] = Query(None, 
         description="Data inicial para filtrar registros (formato ISO 8601)", 
         examples={"exemplo": {"date_start": "2024-01-01T00:00:00"}}
@@ -53,9 +83,30 @@ async def list(
         description="Status da movimentação que deseja filtrar",
         examples={"exemplo": {"status": "Concluído"}}
     ),
-    service: OrderService = Depends(get_service)
+    limit: int = Query(100, ge=1, le=1000, description="Quantidade máxima de registros por página"),
+    offset: int = Query(0, ge=0, description="Quantidade de registros a pular"),
+    stream: bool = Query(False, description="Retorna todos os registros filtrados em NDJSON (ignora `limit`/`offset`/`expand`)"),
+    expand: Optional[str] = Query(None, description=EXPAND_DESCRIPTION, examples={"exemplo": {"expand": "items,client"}}),
+    service: OrderService = Depends(get_read_service),
+    read_maker: sessionmaker = Depends(read_session_maker)
 ):
-    return await service.list(date_start, date_end, product_id, client_id, section, status)
+    if stream:
+        return ndjson_response(
+            lambda session: OrderRepository(session).stream(date_start, date_end, product_id, client_id, section, status),
+            OrderDetailsSchema,
+            read_maker
+        )
+
+    expand = parse_expand(expand)
+    orders = await service.list(date_start, date_end, product_id, client_id, section, status, limit, offset, expand)
+
+    if settings.FAST_JSON_RESPONSES and not expand:
+        result = response = fast_json_response(orders, OrderDetailsSchema)
+    else:
+        result = [OrderExpandedSchema.from_order(order, expand) for order in orders]
+
+    set_total_count(response, await service.count(date_start, date_end, product_id, client_id, section, status))
+    return result
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=OrderDetailsSchema)
@@ -63,11 +114,16 @@ async def create(data: OrderSchema, service: OrderService = Depends(get_service)
     return await service.create(data)
 
 
+@router.post("/checkout", status_code=status.HTTP_201_CREATED, response_model=OrderWithItemsSchema)
+async def checkout(data: OrderCheckoutSchema, service: OrderService = Depends(get_service)):
+    return await service.checkout(data)
+
+
 @router.patch("/{id}", status_code=status.HTTP_200_OK, response_model=OrderDetailsSchema)
 async def update(id: int, data: OrderUpdateSchema, service: OrderService = Depends(get_service)):
     return await service.update(id, data)
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete(id: int, service: OrderService = Depends(get_service), admin: UserModel = Depends(require_admin)):
+async def delete(id: int, service: OrderService = Depends(get_service), admin: Principal = Depends(require_admin)):
     return await service.delete(id)
\ No newline at end of file
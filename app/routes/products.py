@@ -1,35 +1,64 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from app.core.config import settings
 from app.core.database import session_db
+from app.core.replica import session_db_read
 from decimal import Decimal
-from typing import Optional
-from app.core.security import  locked_route, require_admin
-from app.models.users import UserModel
+from typing import List, Optional, Union
+from app.core.security import Principal, locked_route, require_admin
 from app.repositories.products import ProductRepository
-from app.schemas.products import ProductDetailsSchema, ProductSchema, ProductUpdateSchema
+from app.schemas.products import ProductBatchSchema, ProductDetailsSchema, ProductPageSchema, ProductSchema, ProductUpdateSchema
 from app.services.products import ProductService
+from app.utils.batch import parse_ids
+from app.utils.bulk_import import iter_lines, iter_records
+from app.utils.fast_json import fast_json_response
+from app.utils.total_count import set_total_count
 
 router = APIRouter(prefix="/products", tags=["products"])
 
-def get_service(db: AsyncSession = Depends(session_db), locked: UserModel = Depends(locked_route)) -> ProductService:
+def get_service(db: AsyncSession = Depends(session_db), locked: Principal = Depends(locked_route)) -> ProductService:
     return ProductService(ProductRepository(db))
 
+def get_read_service(db: AsyncSession = Depends(session_db_read)) -> ProductService:
+    return ProductService(ProductRepository(db))
+
+
+# declarada antes de `/{id}`, que também casaria com "/batch"
+@router.get("/batch", status_code=status.HTTP_200_OK, response_model=ProductBatchSchema)
+async def get_by_ids(
+    ids: str = Query(..., description="IDs separados por vírgula (máximo `BATCH_MAX_IDS`)", examples={"exemplo": {"ids": "3,1,2"}}),
+    service: ProductService = Depends(get_read_service)
+):
+    return await service.get_by_ids(parse_ids(ids))
+
 
 @router.get("/{id}", status_code=status.HTTP_200_OK, response_model=ProductDetailsSchema)
-async def get_by_id(id: int, service: ProductService = Depends(get_service)):
+async def get_by_id(id: int, service: ProductService = Depends(get_read_service)):
     return await service.get_by_id(id)
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+@router.get("/", status_code=status.HTTP_200_OK, response_model=Union[List[ProductDetailsSchema], ProductPageSchema])
 async def list(
-    limit: int = 10, offset: int = 0,
+    response: Response,
+    limit: int = Query(10, ge=1, le=1000, description="Quantidade máxima de registros por página"),
+    offset: int = Query(0, ge=0, description="Quantidade de registros a pular"),
+    cursor: Optional[str] = Query(None, description="Paginação por cursor: envie vazio na primeira página e depois o `next_cursor` recebido (ignora `offset`)"),
     section: Optional[str] = Query(None, description="Nome da seção que deseja filtrar", examples={"exemplo": {"section": "brinquedos"}}),
     price_min: Optional[Decimal] = Query(None, description="Preço mínimo para filtrar produtos", examples={"exemplo": {"price_min": "10.00"}}),
     price_max: Optional[Decimal] = Query(None, description="Preço maxímo para filtrar produtos", examples={"exemplo": {"price_max": "50.00"}}),
     availability: Optional[bool] = Query(None, description="Disponibilidade do produto", examples={"exemplo": {"availability": "true"}}),
-    service: ProductService = Depends(get_service)
+    service: ProductService = Depends(get_read_service)
 ):
-    return await service.list(limit, offset, section, price_min, price_max, availability)
+    if cursor is not None:
+        result = await service.list_page(limit, cursor, section, price_min, price_max, availability)
+    else:
+        result = await service.list(limit, offset, section, price_min, price_max, availability)
+
+    if settings.FAST_JSON_RESPONSES:
+        result = response = fast_json_response(result, ProductDetailsSchema)
+
+    set_total_count(response, await service.count(section, price_min, price_max, availability))
+    return result
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=ProductDetailsSchema)
@@ -37,11 +66,25 @@ async def create(data: ProductSchema, service: ProductService = Depends(get_serv
     return await service.create(data)
 
 
+@router.post("/import", status_code=status.HTTP_200_OK)
+async def import_products(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Formato do corpo; se omitido, usa o Content-Type (text/csv ou NDJSON)"),
+    batch_size: int = Query(settings.PRODUCT_IMPORT_BATCH_SIZE, ge=1, le=10000, description="Quantidade de produtos gravados por lote"),
+    service: ProductService = Depends(get_service)
+):
+    if format is None:
+        format = "csv" if request.headers.get("content-type", "").startswith("text/csv") else "ndjson"
+
+    records = iter_records(iter_lines(request.stream()), format)
+    return await service.bulk_import(records, batch_size)
+
+
 @router.patch("/{id}", status_code=status.HTTP_200_OK, response_model=ProductDetailsSchema)
 async def update(id: int, data: ProductUpdateSchema, service: ProductService = Depends(get_service)):
     return await service.update(id, data)
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete(id: int, service: ProductService = Depends(get_service), admin: UserModel = Depends(require_admin)) -> None:
+async def delete(id: int, service: ProductService = Depends(get_service), admin: Principal = Depends(require_admin)) -> None:
     await service.delete(id)
\ No newline at end of file
@@ -0,0 +1,26 @@
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.replica import session_db_read
+from app.repositories.sales import SalesRepository
+from app.schemas.reports import SalesReportSchema
+from app.services.reports import ReportService
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+def get_read_service(db: AsyncSession = Depends(session_db_read)) -> ReportService:
+    return ReportService(SalesRepository(db))
+
+
+@router.get("/sales", status_code=status.HTTP_200_OK, response_model=List[SalesReportSchema], response_model_exclude_none=True)
+async def sales(
+    date_start: Optional[date] = Query(None, description="Primeiro dia (UTC) do relatório", examples={"exemplo": {"date_start": "2024-01-01"}}),
+    date_end: Optional[date] = Query(None, description="Último dia (UTC) do relatório", examples={"exemplo": {"date_end": "2024-01-31"}}),
+    section: Optional[str] = Query(None, description="Seção que deseja filtrar (use vazio para produtos sem seção)", examples={"exemplo": {"section": "brinquedos"}}),
+    product_id: Optional[int] = Query(None, description="ID do produto que deseja filtrar", examples={"exemplo": {"product_id": 123}}),
+    by_product: bool = Query(False, description="Detalha os totais de cada dia/seção por produto"),
+    service: ReportService = Depends(get_read_service)
+):
+    """Receita, quantidade e itens vendidos por dia e seção, lidos do resumo `sales_daily` (custo proporcional aos dias, não aos itens)."""
+    return await service.sales(date_start, date_end, section, product_id, by_product)
@@ -1,11 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from app.models.users import UserModel
-from app.schemas.users import LoginResponse, UserRegister, UserOut, UserLogin, TokenResponse, TokenRefreshRequest
+from app.schemas.users import LoginResponse, UserRegister, UserOut, UserLogin, UserUpdateSchema, TokenResponse, TokenRefreshRequest
 from app.repositories.users import UserRepository
 from app.services.users import UserService
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import session_db
-from app.core.security import require_admin
+from app.core.security import Principal, require_admin
 
 router = APIRouter(prefix="/auth", tags=["users"])
 
@@ -14,23 +13,23 @@ def get_service(db: AsyncSession = Depends(session_db)) -> UserService:
 
 
 @router.get('/users/{user_id}', status_code=status.HTTP_200_OK, response_model=UserOut)
-async def list(user_id: int, service: UserService = Depends(get_service), admin: UserModel = Depends(require_admin)):
+async def list(user_id: int, service: UserService = Depends(get_service), admin: Principal = Depends(require_admin)):
     return await service.list(user_id)
 
 
 @router.post('/register', status_code=status.HTTP_201_CREATED, response_model=UserOut)
-async def create(data: UserRegister, service: UserService = Depends(get_service), admin: UserModel = Depends(require_admin)):
+async def create(data: UserRegister, service: UserService = Depends(get_service), admin: Principal = Depends(require_admin)):
     return await service.create(data)
 
 
 @router.put('/users/{user_id}', status_code=status.HTTP_200_OK, response_model=UserOut)
-async def update(user_id: int, service: UserService = Depends(get_service), admin: UserModel = Depends(require_admin)):
-    return await service.update(user_id)
+async def update(user_id: int, data: UserUpdateSchema, service: UserService = Depends(get_service), admin: Principal = Depends(require_admin)):
+    return await service.update(user_id, data)
 
 
-@router.delete('/users/{user_id}', status_code=status.HTTP_200_OK, response_model=UserOut)
-async def delete(user_id: int, service: UserService = Depends(get_service), admin: UserModel = Depends(require_admin)):
-    return await service.delete(user_id)
+@router.delete('/users/{user_id}', status_code=status.HTTP_204_NO_CONTENT)
+async def delete(user_id: int, service: UserService = Depends(get_service), admin: Principal = Depends(require_admin)) -> None:
+    await service.delete(user_id)
 
 
 @router.post('/login', status_code=status.HTTP_200_OK, response_model=LoginResponse)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class CreateClientSchema(BaseModel):
@@ -19,6 +19,14 @@ class ClientSchema(CreateClientSchema):
     created_at: datetime
     updated_at: datetime
 
+class ClientPageSchema(BaseModel):
+    items: List[ClientSchema]
+    next_cursor: Optional[str] = None
+
+class ClientBatchSchema(BaseModel):
+    items: List[ClientSchema]
+    missing: List[int]
+
 class ClientUpdateSchema(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
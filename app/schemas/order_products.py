@@ -6,7 +6,7 @@ from typing import Optional
 class OrderProductsSchema(BaseModel):
     order_id: int
     product_id: int
-    quantity: int
+    quantity: PositiveInt
     price_at_moment: Decimal
 
     model_config = ConfigDict(
@@ -1,6 +1,8 @@
-from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
-from app.schemas.products import ProductSchema
+from typing import AbstractSet, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, PositiveInt
+from app.schemas.clients import ClientSchema
+from app.schemas.products import ProductDetailsSchema, ProductSchema
+from app.schemas.order_products import OrderProductsDetailsSchema
 from datetime import datetime
 from decimal import Decimal
 
@@ -19,6 +21,59 @@ class OrderDetailsSchema(OrderSchema):
     id: int
     created_at: datetime
     updated_at: datetime
+
+class OrderItemCreateSchema(BaseModel):
+    product_id: int
+    quantity: PositiveInt = 1
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="forbid"
+    )
+
+class OrderCheckoutSchema(BaseModel):
+    client_id: int
+    user_id: int
+    status: str
+    items: List[OrderItemCreateSchema] = Field(min_length=1)
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="forbid"
+    )
+
+class OrderWithItemsSchema(OrderDetailsSchema):
+    items: List[OrderProductsDetailsSchema]
+
+class OrderItemExpandedSchema(OrderProductsDetailsSchema):
+    product: Optional[ProductDetailsSchema] = None
+
+class OrderExpandedSchema(OrderDetailsSchema):
+    """Pedido com as relações pedidas em `?expand=` (campos não expandidos ficam fora da resposta)."""
+    items: Optional[List[OrderItemExpandedSchema]] = None
+    client: Optional[ClientSchema] = None
+
+    @classmethod
+    def from_order(cls, order, expand: AbstractSet[str]) -> "OrderExpandedSchema":
+        # só lê relações carregadas pelo repositório: acessar as demais dispararia lazy load (proibido no async)
+        data = OrderDetailsSchema.model_validate(order).model_dump()
+
+        if "client" in expand:
+            data["client"] = ClientSchema.model_validate(order.client)
+        if "items" in expand:
+            data["items"] = [
+                OrderItemExpandedSchema(
+                    **OrderProductsDetailsSchema.model_validate(item).model_dump(),
+                    **({"product": ProductDetailsSchema.model_validate(item.product)} if "items.product" in expand else {})
+                )
+                for item in order.order_products
+            ]
+
+        return cls(**data)
+
+class OrderBatchSchema(BaseModel):
+    items: List[OrderExpandedSchema]
+    missing: List[int]
     
 
 class OrderUpdateSchema(BaseModel):
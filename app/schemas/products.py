@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, HttpUrl, conint
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 from datetime import date, datetime
 
@@ -23,6 +23,14 @@ class ProductDetailsSchema(ProductSchema):
     created_at: datetime
     updated_at: datetime
 
+class ProductPageSchema(BaseModel):
+    items: List[ProductDetailsSchema]
+    next_cursor: Optional[str] = None
+
+class ProductBatchSchema(BaseModel):
+    items: List[ProductDetailsSchema]
+    missing: List[int]
+
 class ProductUpdateSchema(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
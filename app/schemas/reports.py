@@ -0,0 +1,17 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+class SalesReportSchema(BaseModel):
+    day: date
+    section: str
+    product_id: Optional[int] = None
+    quantity: int
+    revenue: Decimal
+    order_lines: int
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="forbid"
+    )
@@ -21,6 +21,18 @@ class UserDetailsSchema(UserSchema):
     username: str
     email: EmailStr
     password: str
+class UserUpdateSchema(BaseModel):
+    username: Optional[str] = None
+    email: Optional[EmailStr] = None
+    password: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra="forbid"
+    )
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
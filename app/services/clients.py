@@ -1,10 +1,19 @@
 from app.repositories.clients import ClientRepository
 from app.schemas.clients import ClientUpdateSchema, CreateClientSchema
 from app.models.clients import ClientModel
+from app.utils.batch import batch_result
+from app.utils.cursor import decode_cursor, encode_cursor
 from app.utils.not_found import not_found
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from pydantic import EmailStr
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+UNIQUE_COLUMNS = ["email", "phone", "name", "address", "cpf_cnpj"]
+
+def raise_conflicts(columns: List[str]) -> None:
+    if columns:
+        raise HTTPException(status.HTTP_409_CONFLICT, f"{', '.join(columns)} já cadastrado.")
 
 class ClientService:
     def __init__(self, client_repo: ClientRepository):
@@ -15,16 +24,37 @@ class ClientService:
         not_found(client, ClientModel, id)
         return client
 
+    async def get_by_ids(self, ids: List[int]) -> Dict[str, Any]:
+        clients = await self.client_repo.get_by_ids(ids)
+        return batch_result(ids, {client.id: client for client in clients})
+
     async def list(self, name: Optional[str], email: Optional[EmailStr], limit: int, offset: int):
         clients = await self.client_repo.list(name, email, limit, offset)
         not_found(clients, ClientModel)
         return clients
 
+    async def count(self, name: Optional[str], email: Optional[EmailStr]) -> Tuple[int, bool]:
+        return await self.client_repo.count(name, email)
+
+    async def search(self, q: str, name: Optional[str], email: Optional[EmailStr], limit: int, offset: int):
+        clients = await self.client_repo.search(q, name, email, limit, offset)
+        not_found(clients, ClientModel)
+        return clients
+
+    async def list_page(self, name: Optional[str], email: Optional[EmailStr], limit: int, cursor: str) -> Dict[str, Any]:
+        after = tuple(decode_cursor(cursor, str, int)) if cursor else None
+
+        # busca um registro a mais só para saber se existe próxima página
+        clients = await self.client_repo.list_after(name, email, limit + 1, after)
+        not_found(clients, ClientModel)
+
+        items = clients[:limit]
+        next_cursor = encode_cursor(items[-1].name, items[-1].id) if items and len(clients) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
     async def create(self, data: CreateClientSchema) -> ClientModel:
-        
-        for column in ["email", "phone", "name", "address", "cpf_cnpj"]:
-            if await self.client_repo.get_by_field(column, getattr(data, column)):
-                raise HTTPException(status.HTTP_409_CONFLICT, f"{column} já cadastrado.")
+        values = {column: getattr(data, column) for column in UNIQUE_COLUMNS}
+        raise_conflicts(await self.client_repo.get_conflicts(values))
                 
         client = ClientModel(
             name = data.name,
@@ -34,7 +64,12 @@ class ClientService:
             address =  data.address
         )
 
-        return await self.client_repo.create(client)
+        try:
+            return await self.client_repo.create(client)
+        except IntegrityError:
+            # outra requisição cadastrou os mesmos dados entre a checagem e o insert
+            raise_conflicts(await self.client_repo.get_conflicts(values))
+            raise
 
     async def update(self, id: int, data: ClientUpdateSchema) -> ClientModel:
         client = await self.client_repo.get_by_id(id)
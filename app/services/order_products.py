@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 from fastapi import HTTPException, status
 from app.models.order_products import OrderProductsModel
 from app.models.orders import OrderModel
@@ -8,6 +8,8 @@ from app.repositories.orders import OrderRepository
 from app.repositories.products import ProductRepository
 from app.schemas.order_products import OrderProductsDetailsSchema, OrderProductsSchema, OrderProductsUpdateSchema
 from app.repositories.order_products import OrderProductsRepository
+from app.repositories.sales import SalesRepository, sales_delta
+from app.services.products import change_stock, invalidate_stock
 from app.utils.not_found import not_found
 
 class OrderProductsService:
@@ -15,10 +17,12 @@ class OrderProductsService:
         order_repo: OrderRepository,
         product_repo: ProductRepository,
         order_products_repo: OrderProductsRepository,
+        sales_repo: SalesRepository,
     ):
         self.order_repo = order_repo
         self.product_repo = product_repo
         self.order_products_repo = order_products_repo
+        self.sales_repo = sales_repo
 
     async def get_by_id(self, id: int) -> OrderProductsDetailsSchema:
         data = await self.order_products_repo.get_by_id(id)
@@ -32,40 +36,85 @@ class OrderProductsService:
         price_at_moment_min: Optional[int] = None,
         price_at_moment_max: Optional[int] = None,
         date_start: Optional[datetime] = None, 
-        date_end: Optional[datetime] = None
+        date_end: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
     ) -> list[OrderProductsDetailsSchema]:
-        data = await self.order_products_repo.list(order_id, product_id, quantity, price_at_moment_min, price_at_moment_max, date_start, date_end)
+        data = await self.order_products_repo.list(order_id, product_id, quantity, price_at_moment_min, price_at_moment_max, date_start, date_end, limit, offset)
         not_found(data, OrderProductsModel)
         return data
 
+    async def count(self,
+        order_id: Optional[int] = None,
+        product_id: Optional[int] = None,
+        quantity: Optional[int] = None,
+        price_at_moment_min: Optional[int] = None,
+        price_at_moment_max: Optional[int] = None,
+        date_start: Optional[datetime] = None, 
+        date_end: Optional[datetime] = None,
+    ) -> Tuple[int, bool]:
+        return await self.order_products_repo.count(order_id, product_id, quantity, price_at_moment_min, price_at_moment_max, date_start, date_end)
+
     async def create(self, data: OrderProductsSchema) -> OrderProductsSchema:
 
         if await self.order_products_repo.get_by_order_and_product(data.order_id, data.product_id):
             raise HTTPException(status.HTTP_409_CONFLICT, f"Já existe um item para order_id={data.order_id} e product_id={data.product_id}.")
         
-        not_found(await self.order_repo.get_by_id(data.order_id), OrderModel, data.order_id)
-        not_found(await self.product_repo.get_by_id(data.product_id), ProductModel, data.product_id)
+        order = await self.order_repo.get_by_id(data.order_id)
+        not_found(order, OrderModel, data.order_id)
+        product = await self.product_repo.get_by_id(data.product_id)
+        not_found(product, ProductModel, data.product_id)
         
         order_product = OrderProductsModel(
             order_id = data.order_id,
             product_id = data.product_id,
             quantity = data.quantity,
-            price_at_moment = data.price_at_moment
+            price_at_moment = data.price_at_moment,
+            section = product.section
         )
 
-        return await self.order_products_repo.create(order_product)
+        await change_stock(self.product_repo, product.id, -data.quantity)
+        await self.sales_repo.record([
+            sales_delta(order.created_at, product.section, product.id, data.quantity, data.quantity * data.price_at_moment, 1)
+        ])
+        order_product = await self.order_products_repo.create(order_product)
+        invalidate_stock([product.id])
+        return order_product
     
     async def update(self, id: int, data: OrderProductsUpdateSchema) -> OrderProductsSchema:
-        not_found(await self.order_repo.get_by_id(data.order_id), OrderModel, data.order_id)
-        not_found(await self.product_repo.get_by_id(data.product_id), ProductModel, data.product_id)
-        
         base_data = await self.order_products_repo.get_by_id(id)
         not_found(base_data, OrderProductsModel, id)
-        return await self.order_products_repo.update(base_data, data)
+
+        order = await self.order_repo.get_by_id(base_data.order_id)
+        product = await self.product_repo.get_by_id(base_data.product_id)
+
+        quantity = data.quantity if data.quantity is not None else base_data.quantity
+        price = data.price_at_moment if data.price_at_moment is not None else base_data.price_at_moment
+
+        if quantity != base_data.quantity:
+            await change_stock(self.product_repo, product.id, base_data.quantity - quantity)
+        await self.sales_repo.record([
+            sales_delta(
+                order.created_at, base_data.section, product.id,
+                quantity - base_data.quantity, quantity * price - base_data.quantity * base_data.price_at_moment, 0
+            )
+        ])
+        base_data = await self.order_products_repo.update(base_data, data)
+        invalidate_stock([product.id])
+        return base_data
         
     async def delete(self, id: int) -> None:
-        data = await self.product_repo.get_by_id(id)
+        data = await self.order_products_repo.get_by_id(id)
         not_found(data, OrderProductsModel, id)
+
+        order = await self.order_repo.get_by_id(data.order_id)
+        product = await self.product_repo.get_by_id(data.product_id)
+
+        await change_stock(self.product_repo, product.id, data.quantity)
+        await self.sales_repo.record([
+            sales_delta(order.created_at, data.section, product.id, -data.quantity, -data.quantity * data.price_at_moment, -1)
+        ])
         await self.order_products_repo.delete(data)
+        invalidate_stock([product.id])
         
         
\ No newline at end of file
@@ -1,27 +1,63 @@
+from collections import Counter
 from datetime import datetime
-from typing import Optional
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from fastapi import HTTPException, status as HTTPSatus
+from app.models.clients import ClientModel
+from app.models.order_products import OrderProductsModel
 from app.models.orders import OrderModel
+from app.models.products import ProductModel
+from app.models.users import UserModel
 from app.repositories.clients import ClientRepository
 from app.repositories.orders import OrderRepository
+from app.repositories.products import ProductRepository
+from app.repositories.sales import SalesRepository, sales_delta
+from app.services.products import change_stock, invalidate_stock
 from app.repositories.users import UserRepository
-from app.schemas.orders import OrderDetailsSchema, OrderSchema, OrderUpdateSchema
+from app.schemas.orders import OrderCheckoutSchema, OrderDetailsSchema, OrderExpandedSchema, OrderSchema, OrderUpdateSchema, OrderWithItemsSchema
+from app.utils.batch import batch_result
 from app.utils.not_found import not_found
 
+EXPANDABLE = ("items", "items.product", "client")
+
+def parse_expand(expand: Optional[str]) -> FrozenSet[str]:
+    """Converte `?expand=items.product,client` no conjunto de relações; `items.product` implica `items`."""
+    if not expand:
+        return frozenset()
+
+    fields = {field.strip() for field in expand.split(",") if field.strip()}
+    invalid = sorted(fields - set(EXPANDABLE))
+    if invalid:
+        raise HTTPException(
+            status_code=HTTPSatus.HTTP_400_BAD_REQUEST,
+            detail=f"Expansão inválida: {', '.join(invalid)}. Opções: {', '.join(EXPANDABLE)}."
+        )
+
+    if "items.product" in fields:
+        fields.add("items")
+    return frozenset(fields)
+
 class OrderService:
-    def __init__(self, order_repo: OrderRepository, user_repo: UserRepository, client_repo: ClientRepository):
+    def __init__(self, order_repo: OrderRepository, user_repo: UserRepository, client_repo: ClientRepository, product_repo: ProductRepository, sales_repo: SalesRepository):
         self.client_repo = client_repo
         self.order_repo = order_repo
         self.user_repo = user_repo
+        self.product_repo = product_repo
+        self.sales_repo = sales_repo
 
 
-    async def get_by_id(self, id: int) -> OrderModel:
-        order = await self.order_repo.get_by_id(id)
+    async def get_by_id(self, id: int, expand: FrozenSet[str] = frozenset()) -> OrderModel:
+        order = await self.order_repo.get_by_id(id, expand)
         not_found(order, OrderModel, id)
         return order
 
 
+    async def get_by_ids(self, ids: List[int], expand: FrozenSet[str] = frozenset()) -> Dict[str, Any]:
+        orders = await self.order_repo.get_by_ids(ids, expand)
+        return batch_result(ids, {order.id: OrderExpandedSchema.from_order(order, expand) for order in orders})
+
+
     async def list(self, 
         date_start: Optional[datetime] = None, 
         date_end: Optional[datetime] = None,
@@ -29,12 +65,26 @@ class OrderService:
         client_id: Optional[int] = None,
         section: Optional[str] = None,
         status: Optional[str] = None, 
+        limit: int = 100,
+        offset: int = 0,
+        expand: FrozenSet[str] = frozenset(),
     ) -> list[OrderModel]:
-        order = await self.order_repo.list(date_start, date_end, product_id, client_id, section, status)
+        order = await self.order_repo.list(date_start, date_end, product_id, client_id, section, status, limit, offset, expand)
         not_found(order, OrderModel)
         return order
 
 
+    async def count(self, 
+        date_start: Optional[datetime] = None, 
+        date_end: Optional[datetime] = None,
+        product_id: Optional[int] = None,
+        client_id: Optional[int] = None,
+        section: Optional[str] = None,
+        status: Optional[str] = None, 
+    ) -> Tuple[int, bool]:
+        return await self.order_repo.count(date_start, date_end, product_id, client_id, section, status)
+
+
     async def create(self, data: OrderSchema) -> OrderModel:
                 
         client_id = await self.client_repo.get_by_id(data.client_id)
@@ -53,6 +103,51 @@ class OrderService:
         return await self.order_repo.create(order)
 
 
+    async def checkout(self, data: OrderCheckoutSchema) -> OrderWithItemsSchema:
+        not_found(await self.client_repo.get_by_id(data.client_id), ClientModel, data.client_id)
+        not_found(await self.user_repo.get_by_id(data.user_id), UserModel, data.user_id)
+
+        # itens repetidos do mesmo produto viram uma única linha (uq_order_product)
+        quantities = Counter()
+        for item in data.items:
+            quantities[item.product_id] += item.quantity
+
+        products = {product.id: product for product in await self.product_repo.get_by_ids(list(quantities))}
+        for product_id in quantities:
+            not_found(products.get(product_id), ProductModel, product_id)
+
+        # baixa o estoque sempre na mesma ordem (por ID) para checkouts concorrentes não se travarem
+        for product_id in sorted(quantities):
+            await change_stock(self.product_repo, product_id, -quantities[product_id])
+
+        items = [
+            OrderProductsModel(
+                product_id = product_id,
+                quantity = quantity,
+                price_at_moment = products[product_id].price,
+                section = products[product_id].section
+            )
+            for product_id, quantity in quantities.items()
+        ]
+
+        order = OrderModel(
+            client_id = data.client_id,
+            user_id = data.user_id,
+            status = data.status,
+            total_amount = sum((item.price_at_moment * item.quantity for item in items), Decimal("0.00"))
+        )
+
+        order = await self.order_repo.add_with_items(order, items)
+        await self.sales_repo.record([
+            sales_delta(order.created_at, item.section, item.product_id, item.quantity, item.price_at_moment * item.quantity, 1)
+            for item in items
+        ])
+        await self.order_repo.commit()
+        invalidate_stock(quantities)
+
+        return OrderWithItemsSchema(**OrderDetailsSchema.model_validate(order).model_dump(), items=items)
+
+
     async def update(self, id: int, data: OrderUpdateSchema) -> OrderModel:
         order = await self.order_repo.get_by_id(id)
         not_found(order, OrderModel, id)
@@ -60,7 +155,18 @@ class OrderService:
 
 
     async def delete(self, id: int) -> None:
-        order = await self.order_repo.get_by_id(id)
+        order = await self.order_repo.get_by_id(id, frozenset({"items"}))
         not_found(order, OrderModel, id)
+
+        items = sorted(order.order_products, key=lambda item: item.product_id)
+        for item in items:
+            await change_stock(self.product_repo, item.product_id, item.quantity)
+
+        await self.sales_repo.record([
+            sales_delta(order.created_at, item.section, item.product_id, -item.quantity, -item.price_at_moment * item.quantity, -1)
+            for item in items
+        ])
+        product_ids = [item.product_id for item in items]
         await self.order_repo.delete(order)
+        invalidate_stock(product_ids)
         
\ No newline at end of file
@@ -1,30 +1,145 @@
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+from datetime import datetime
 from decimal import Decimal
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.products import ProductModel
 from app.repositories.products import ProductRepository
-from app.schemas.products import ProductSchema, ProductUpdateSchema
+from app.schemas.products import ProductDetailsSchema, ProductSchema, ProductUpdateSchema
+from app.utils.batch import batch_result
+from app.utils.cursor import decode_cursor, encode_cursor
 from app.utils.not_found import not_found
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+
+# Catálogo muda pouco e é muito lido: produtos por ID e resultados de listagem por filtros.
+# Guardam `ProductDetailsSchema` (e não models), para não compartilhar objetos entre sessões.
+product_cache = TTLCache(maxsize=settings.PRODUCT_CACHE_MAX_SIZE, ttl=settings.PRODUCT_CACHE_TTL_SECONDS)
+product_list_cache = TTLCache(maxsize=settings.PRODUCT_LIST_CACHE_MAX_SIZE, ttl=settings.PRODUCT_CACHE_TTL_SECONDS)
+
+def normalize_section(section: Optional[str]) -> Optional[str]:
+    """Filtro de seção sem espaços nas pontas (vazio = sem filtro); aplicado antes da chave do cache e da consulta."""
+    return (section or "").strip() or None
+
+def list_cache_key(mode: str, limit: int, position: Any, section: Optional[str], price_min: Optional[Decimal], price_max: Optional[Decimal], availability: Optional[bool]) -> Tuple:
+    """
+    Normaliza os filtros (seção sem caixa, preços sem zeros à direita) para a chave do cache.
+    `section` já deve vir de `normalize_section`; a caixa é ignorada porque o filtro usa `ilike`.
+    """
+    return (
+        mode, limit, position,
+        section.lower() if section else None,
+        str(price_min.normalize()) if price_min is not None else None,
+        str(price_max.normalize()) if price_max is not None else None,
+        availability,
+    )
+
+async def change_stock(product_repo: ProductRepository, id: int, delta: int) -> int:
+    """Reserva (`delta` < 0) ou devolve (`delta` > 0) estoque na transação atual; 409 se não houver saldo."""
+    stock = await product_repo.change_stock(id, delta)
+    if stock is None:
+        raise HTTPException(status.HTTP_409_CONFLICT, f"Estoque insuficiente para o produto id={id}.")
+    return stock
+
+def invalidate_stock(ids: Iterable[int]) -> None:
+    """
+    Chamado após o commit de vendas/devoluções: descarta os produtos por ID e as listagens
+    (o estoque aparece nelas e muda o resultado do filtro `availability`).
+    """
+    for id in ids:
+        product_cache.invalidate(id)
+    product_list_cache.clear()
 
 class ProductService:
     def __init__(self, product_repo: ProductRepository):
         self.product_repo = product_repo
 
 
-    async def get_by_id(self, id: int) -> ProductModel:
+    async def get_by_id(self, id: int) -> ProductDetailsSchema:
+        cached = product_cache.get(id)
+        if cached is not None:
+            return cached
+
         product = await self.product_repo.get_by_id(id)
         not_found(product, ProductModel, id)
-        return product
+
+        details = ProductDetailsSchema.model_validate(product)
+        product_cache.set(id, details)
+        return details
+
+
+    async def get_by_ids(self, ids: List[int]) -> Dict[str, Any]:
+        """Lê os IDs do cache e busca só os que faltam, com um único `WHERE id IN (...)`."""
+        found = {}
+        for id in ids:
+            cached = product_cache.get(id)
+            if cached is not None:
+                found[id] = cached
+
+        misses = [id for id in ids if id not in found]
+        if misses:
+            for product in await self.product_repo.get_by_ids(misses):
+                found[product.id] = ProductDetailsSchema.model_validate(product)
+                product_cache.set(product.id, found[product.id])
+
+        return batch_result(ids, found)
 
 
     async def list(self, 
         limit: int, offset: int, section: Optional[str], price_min: Optional[Decimal], price_max: Optional[Decimal], availability: Optional[str]
-    ) -> ProductModel:
+    ) -> List[ProductDetailsSchema]:
+        section = normalize_section(section)
+        key = list_cache_key("offset", limit, offset, section, price_min, price_max, availability)
+        cached = product_list_cache.get(key)
+        if cached is not None:
+            return cached
+
         product = await self.product_repo.list(limit, offset, section, price_min, price_max, availability)
         not_found(product, ProductModel)
+
+        product = [ProductDetailsSchema.model_validate(item) for item in product]
+        product_list_cache.set(key, product)
         return product
 
 
+    async def count(self,
+        section: Optional[str], price_min: Optional[Decimal], price_max: Optional[Decimal], availability: Optional[bool]
+    ) -> Tuple[int, bool]:
+        section = normalize_section(section)
+        key = list_cache_key("count", None, None, section, price_min, price_max, availability)
+        cached = product_list_cache.get(key)
+        if cached is not None:
+            return cached
+
+        total = await self.product_repo.count(section, price_min, price_max, availability)
+        product_list_cache.set(key, total)
+        return total
+
+
+    async def list_page(self, 
+        limit: int, cursor: str, section: Optional[str], price_min: Optional[Decimal], price_max: Optional[Decimal], availability: Optional[bool]
+    ) -> Dict[str, Any]:
+        section = normalize_section(section)
+        key = list_cache_key("cursor", limit, cursor, section, price_min, price_max, availability)
+        cached = product_list_cache.get(key)
+        if cached is not None:
+            return cached
+
+        after = tuple(decode_cursor(cursor, str, int)) if cursor else None
+
+        # busca um registro a mais só para saber se existe próxima página
+        products = await self.product_repo.list_after(limit + 1, after, section, price_min, price_max, availability)
+        not_found(products, ProductModel)
+
+        items = products[:limit]
+        next_cursor = encode_cursor(items[-1].name, items[-1].id) if items and len(products) > limit else None
+
+        page = {"items": [ProductDetailsSchema.model_validate(item) for item in items], "next_cursor": next_cursor}
+        product_list_cache.set(key, page)
+        return page
+
+
     async def create(self, data: ProductSchema) -> ProductModel:
         
         if await self.product_repo.get_by_barcode(data.barcode):
@@ -41,16 +156,83 @@ class ProductService:
             image_url=data.image_url
         )
 
-        return await self.product_repo.create(product)
+        product = await self.product_repo.create(product)
+        product_list_cache.clear()
+        return product
+
+
+    async def bulk_import(self, records: AsyncIterator[Tuple[int, Union[Dict[str, Any], str]]], batch_size: int) -> Dict[str, Any]:
+        """
+        Valida cada registro com `ProductSchema` e grava em lotes de `batch_size` (upsert por barcode).
+        Erros de validação ou de banco são reportados por linha, sem interromper a importação.
+        """
+        report = {"received": 0, "imported": 0, "errors": []}
+        batch: Dict[Any, Tuple[int, Dict[str, Any]]] = {}
+
+        async def write(lines: List[Tuple[int, Dict[str, Any]]]):
+            # lote recusado pelo banco: grava cada metade separadamente até isolar as linhas inválidas
+            try:
+                await self.product_repo.upsert_many([row for _, row in lines])
+                report["imported"] += len(lines)
+            except DBAPIError:
+                if len(lines) == 1:
+                    # sem a mensagem do driver, que expõe SQL e parâmetros
+                    report["errors"].append({"line": lines[0][0], "detail": "Produto recusado pelo banco de dados (valor fora dos limites ou em conflito)."})
+                    return
+                middle = len(lines) // 2
+                await write(lines[:middle])
+                await write(lines[middle:])
+
+        async def flush():
+            await write(list(batch.values()))
+            batch.clear()
+
+        async for line, record in records:
+            report["received"] += 1
+
+            if isinstance(record, str):
+                report["errors"].append({"line": line, "detail": record})
+                continue
+
+            try:
+                product = ProductSchema.model_validate(record)
+            except ValidationError as e:
+                report["errors"].append({"line": line, "detail": e.errors(include_url=False, include_context=False, include_input=False)})
+                continue
+
+            row = product.model_dump()
+            if isinstance(row["expiration_date"], datetime):
+                row["expiration_date"] = row["expiration_date"].date()
+
+            # no mesmo lote, o último registro de um barcode prevalece
+            batch[row["barcode"] if row["barcode"] is not None else ("line", line)] = (line, row)
+
+            if len(batch) >= batch_size:
+                await flush()
+
+        if batch:
+            await flush()
+
+        report["errors"].sort(key=lambda error: error["line"])
+
+        # o upsert pode ter alterado produtos existentes (por barcode), sem saber seus IDs
+        product_cache.clear()
+        product_list_cache.clear()
+        return report
 
 
     async def update(self, id: int, data: ProductUpdateSchema) -> ProductModel:
         product = await self.product_repo.get_by_id(id)
         not_found(product, ProductModel, id)
-        return await self.product_repo.update(product, data)
+        product = await self.product_repo.update(product, data)
+        product_cache.invalidate(id)
+        product_list_cache.clear()
+        return product
 
 
     async def delete(self, id: int) -> None:
         product = await self.product_repo.get_by_id(id)
         not_found(product, ProductModel, id)
-        await self.product_repo.delete(product)
\ No newline at end of file
+        await self.product_repo.delete(product)
+        product_cache.invalidate(id)
+        product_list_cache.clear()
\ No newline at end of file
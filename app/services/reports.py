@@ -0,0 +1,20 @@
+from datetime import date
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, status
+from app.repositories.sales import SalesRepository
+
+class ReportService:
+    def __init__(self, sales_repo: SalesRepository):
+        self.sales_repo = sales_repo
+
+    async def sales(self,
+        date_start: Optional[date] = None,
+        date_end: Optional[date] = None,
+        section: Optional[str] = None,
+        product_id: Optional[int] = None,
+        by_product: bool = False,
+    ) -> List[Dict[str, Any]]:
+        if date_start is not None and date_end is not None and date_start > date_end:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "date_start deve ser anterior ou igual a date_end.")
+
+        return await self.sales_repo.report(date_start, date_end, section, product_id, by_product)
@@ -3,8 +3,10 @@ from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from app.repositories.users import UserRepository
 from app.models.users import UserModel
-from app.schemas.users import UserLogin, UserOut, UserRegister
+from app.schemas.users import UserLogin, UserOut, UserRegister, UserUpdateSchema
 from app.core.config import settings
+from app.core.executor import BoundedExecutor
+from app.core.security import invalidate_user
 from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
 
@@ -12,6 +14,9 @@ from app.utils.not_found import not_found
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt bloqueia por dezenas de ms: roda fora do event loop, em um pool limitado.
+password_executor = BoundedExecutor(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE, "bcrypt")
+
 class UserService:
     def __init__(self, user_repo: UserRepository):
         self.user_repo = user_repo
@@ -32,37 +37,50 @@ class UserService:
         user = UserModel(
             username = data.username,
             email = data.email,
-            hashed_password = self.hash_password(data.password)
+            hashed_password = await self.hash_password(data.password)
         )
          
         return await self.user_repo.create(user)
 
-    async def update(self, id: int, data: UserRegister) -> UserModel:
+    async def update(self, id: int, data: UserUpdateSchema) -> UserModel:
         user = await self.user_repo.get_by_id(id)
         not_found(user, UserModel, id)
-        return await self.user_repo.update(user, data)
+
+        if data.email is not None and data.email != user.email and await self.user_repo.get_by_email(data.email):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="E-mail já cadastrado.")
+
+        if data.password is not None:
+            if len(data.password) < 8:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Senha deve ter pelo menos 8 caracteres.")
+            user.hashed_password = await self.hash_password(data.password)
+
+        # o repositório incrementa `token_version`, revogando os tokens emitidos antes da alteração
+        user = await self.user_repo.update(user, data)
+        invalidate_user(id)
+        return user
 
     async def delete(self, id: int) -> None:
         user = await self.user_repo.get_by_id(id)
         not_found(user, UserModel, id)
         await self.user_repo.delete(user)
+        invalidate_user(id)
 
-    def hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def hash_password(self, password: str) -> str:
+        return await password_executor.run(pwd_context.hash, password)
     
-    def verify_password(self, password: str, hash_password: str) -> bool:
-        return pwd_context.verify(password, hash_password)
+    async def verify_password(self, password: str, hash_password: str) -> bool:
+        return await password_executor.run(pwd_context.verify, password, hash_password)
     
     async def login(self, data: UserLogin) -> Dict[str, Any]:
         user = await self.user_repo.get_by_email(data.email)
 
-        if not user or not pwd_context.verify(data.password, user.hashed_password):
+        if not user or not await self.verify_password(data.password, user.hashed_password):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciais inválidas.")
             
         return {
             "token": {
-                "access_token": self.create_access_token({"sub": user.id}),
-                "refresh_token": self.create_refresh_token({"sub": user.id}),
+                "access_token": self.create_access_token(self.token_claims(user)),
+                "refresh_token": self.create_refresh_token(self.token_claims(user, refresh=True)),
                 "token_type": "bearer",
             },
             "user": UserOut.model_validate(user)
@@ -80,14 +98,30 @@ class UserService:
             if not user_id:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de refresh inválido ou expirado.")
 
-            if not await self.user_repo.get_by_id(int(user_id)):
+            user = await self.user_repo.get_by_id(int(user_id))
+
+            if not user or not user.is_active:
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuário não existe ou está desativado.")
 
-            return self.create_access_token({"sub": user_id})
+            if "ver" in payload and payload["ver"] != user.token_version:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de refresh inválido ou expirado.")
+
+            return self.create_access_token(self.token_claims(user))
 
         except JWTError as e:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de refresh inválido ou expirado." )
         
+    def token_claims(self, user: UserModel, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Claims do token. Com `ACCESS_TOKEN_CLAIMS`, o access token leva `is_admin`/`is_active`/`ver`
+        e `locked_route` autoriza sem carregar o usuário; o refresh token leva só `ver`.
+        """
+        if not settings.ACCESS_TOKEN_CLAIMS:
+            return {"sub": user.id}
+        if refresh:
+            return {"sub": user.id, "ver": user.token_version}
+        return {"sub": user.id, "is_admin": user.is_admin, "is_active": user.is_active, "ver": user.token_version}
+
     def create_access_token(self, data: dict, expire_delta: int = 30) -> str:
         to_encode = data.copy()
         to_encode["sub"] = str(to_encode.get("sub"))
@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Mapping
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+# IDs são colunas INTEGER: valores fora desta faixa nunca existem (e estouram o parâmetro no PostgreSQL)
+MAX_ID = 2**31 - 1
+
+def parse_ids(ids: str) -> List[int]:
+    """
+    Converte `?ids=3,1,2` na lista de IDs, na ordem pedida e sem repetições.
+
+    - 400 se vierem mais de `BATCH_MAX_IDS` valores (contados antes de converter e de remover repetidos),
+      se algum não for inteiro entre 1 e `MAX_ID` ou se a lista vier vazia.
+    """
+    values = [value.strip() for value in ids.split(",") if value.strip()]
+
+    if len(values) > settings.BATCH_MAX_IDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"No máximo {settings.BATCH_MAX_IDS} IDs por consulta.")
+
+    try:
+        parsed = list(dict.fromkeys(int(value) for value in values))
+        if not all(0 < id <= MAX_ID for id in parsed):
+            raise ValueError
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="IDs inválidos: informe inteiros positivos separados por vírgula.")
+
+    if not parsed:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Informe ao menos um ID.")
+
+    return parsed
+
+def batch_result(ids: List[int], found: Mapping[int, Any]) -> Dict[str, Any]:
+    """Resposta dos endpoints `/batch`: `items` na ordem de `ids` e `missing` com os IDs não encontrados."""
+    return {
+        "items": [found[id] for id in ids if id in found],
+        "missing": [id for id in ids if id not in found],
+    }
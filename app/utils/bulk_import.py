@@ -0,0 +1,64 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, Tuple, Union
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Quebra um corpo recebido em pedaços (`request.stream()`) em linhas UTF-8, sem carregá-lo inteiro."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_records(lines: AsyncIterator[str], format: str) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], str]]]:
+    """
+    Converte linhas CSV (com cabeçalho) ou NDJSON em dicionários.
+
+    ---
+    ### **Retorno**
+    - Gera `(numero_da_linha, registro)`; se a linha for inválida, `registro` é a mensagem de erro.
+    - Linhas em branco são ignoradas; no CSV, campos vazios viram `None`.
+    - **Obs:** campos CSV entre aspas não podem conter quebra de linha.
+    """
+    header = None
+    line_number = 0
+
+    async for line in lines:
+        line_number += 1
+
+        if not line.strip():
+            continue
+
+        if format == "csv":
+            values = next(csv.reader([line]))
+
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+
+            if len(values) != len(header):
+                yield line_number, f"Esperadas {len(header)} colunas, recebidas {len(values)}."
+                continue
+
+            yield line_number, {name: (value if value != "" else None) for name, value in zip(header, values)}
+        else:
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, f"JSON inválido: {e}"
+                continue
+
+            if not isinstance(record, dict):
+                yield line_number, "Cada linha deve ser um objeto JSON."
+                continue
+
+            yield line_number, record
@@ -0,0 +1,36 @@
+import base64
+import json
+from typing import Any, List
+from fastapi import HTTPException, status
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Gera um cursor opaco (base64 url-safe) a partir dos valores da chave de ordenação.
+
+    ### **Exemplo de uso**
+    ```python
+        encode_cursor(ultimo.name, ultimo.id)
+    ```
+    """
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    """
+    Decodifica um cursor gerado por `encode_cursor`, lançando HTTP 400 se estiver malformado
+    ou se os valores não forem dos tipos esperados (ex: `decode_cursor(cursor, str, int)`).
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        values = None
+
+    if (
+        not isinstance(values, list) or len(values) != len(types)
+        # bool é subclasse de int: `[name, true]` não é um cursor válido
+        or any(isinstance(value, bool) or not isinstance(value, type_) for value, type_ in zip(values, types))
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido.")
+
+    return values
@@ -0,0 +1,76 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Union
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # dependência opcional: sem ela, cai no `json` da biblioteca padrão
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # mesmo formato que o Pydantic usa no modo JSON
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """`JSONResponse` que serializa com orjson quando disponível."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache
+def serializer(schema: type[BaseModel]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Monta (uma vez por schema) uma função que lê direto os atributos declarados no schema.
+
+    ---
+    ### **Quando usar**
+    - Apenas com dados confiáveis (models vindos do banco ou schemas já validados): aqui não há
+      validação, só a cópia dos campos, que é o que o `response_model` faria de forma bem mais cara.
+    """
+    names = tuple(schema.model_fields)
+    getter = attrgetter(*names)
+
+    if len(names) == 1:
+        return lambda row: {names[0]: getter(row)}
+    return lambda row: dict(zip(names, getter(row)))
+
+
+def fast_json_response(content: Union[Iterable[Any], Dict[str, Any]], schema: type[BaseModel]) -> FastJSONResponse:
+    """
+    Responde uma listagem (lista de registros ou página `{"items": [...], ...}`) sem passar pelo `response_model`.
+
+    ---
+    ### **Exemplo de uso**
+    ```python
+        if settings.FAST_JSON_RESPONSES:
+            return fast_json_response(await service.list(...), ProductDetailsSchema)
+    ```
+    """
+    to_dict = serializer(schema)
+
+    if isinstance(content, dict):
+        return FastJSONResponse({**content, "items": [to_dict(row) for row in content["items"]]})
+
+    items: List[Dict[str, Any]] = [to_dict(row) for row in content]
+    return FastJSONResponse(items)
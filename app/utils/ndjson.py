@@ -0,0 +1,33 @@
+from typing import Any, AsyncIterator, Callable
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.database import async_session_maker
+
+def ndjson_response(
+    stream: Callable[[AsyncSession], AsyncIterator[Any]],
+    schema: type[BaseModel],
+    session_maker: sessionmaker = async_session_maker
+) -> StreamingResponse:
+    """
+    Responde em NDJSON (um JSON por linha), serializando cada registro à medida que sai do cursor.
+
+    ---
+    ### **Por que uma sessão própria?**
+    - A sessão de `session_db` é fechada antes do corpo da resposta ser enviado.
+    - Aqui a sessão vive enquanto o cursor do servidor estiver sendo consumido, e nunca há
+      mais que um lote (`yield_per`) de registros em memória.
+
+    ---
+    ### **Exemplo de uso**
+    ```python
+        return ndjson_response(lambda session: OrderRepository(session).stream(status="pago"), OrderDetailsSchema)
+    ```
+    """
+    async def body():
+        async with session_maker() as session:
+            async for row in stream(session):
+                yield schema.model_validate(row).model_dump_json() + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
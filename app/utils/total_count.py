@@ -0,0 +1,60 @@
+import json
+from typing import Tuple
+from fastapi import Response
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON) <consulta>` mantendo os parâmetros da consulta original."""
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def total_count(session: AsyncSession, query: Select, exact_limit: int) -> Tuple[int, bool]:
+    """
+    Total de registros de `query` (sem `limit`/`offset`), retornando `(total, estimado)`.
+
+    ---
+    ### **Como conta**
+    - Primeiro conta no máximo `exact_limit + 1` linhas: barato e exato para tabelas pequenas
+      ou filtros seletivos.
+    - Passando disso, no PostgreSQL usa as estatísticas do planner: `pg_class.reltuples` sem
+      filtros, ou a estimativa de linhas do `EXPLAIN` com filtros. Em outros bancos, conta tudo.
+    """
+    query = query.order_by(None)
+
+    bounded = select(func.count()).select_from(query.limit(exact_limit + 1).subquery())
+    total = (await session.execute(bounded)).scalar_one()
+    if total <= exact_limit:
+        return total, False
+
+    if session.bind.dialect.name != "postgresql":
+        exact = select(func.count()).select_from(query.subquery())
+        return (await session.execute(exact)).scalar_one(), False
+
+    if query.whereclause is None and len(query.get_final_froms()) == 1:
+        table = query.get_final_froms()[0]
+        reltuples = (await session.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table.name}
+        )).scalar_one_or_none()
+        # -1: tabela nunca analisada (ANALYZE/autovacuum), cai no EXPLAIN
+        if reltuples is not None and reltuples >= 0:
+            return max(int(reltuples), total), True
+
+    plan = (await session.execute(Explain(query))).scalar_one()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return max(int(plan[0]["Plan"]["Plan Rows"]), total), True
+
+
+def set_total_count(response: Response, total: Tuple[int, bool]) -> None:
+    count, estimated = total
+    response.headers["X-Total-Count"] = str(count)
+    response.headers["X-Total-Count-Estimated"] = "true" if estimated else "false"
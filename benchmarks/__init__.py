@@ -0,0 +1 @@
+# Benchmarks executados manualmente: python -m benchmarks.<nome>
@@ -0,0 +1,81 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Por padrão usa um SQLite temporário, para rodar sem infraestrutura;
+defina `DATABASE_URL` para medir contra um PostgreSQL real. Como os benchmarks recriam
+as tabelas, fora do SQLite é preciso confirmar com `--reset`.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.gettempdir()}/lu-benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+import math
+from typing import Dict, List
+from httpx import ASGITransport, AsyncClient
+from fastapi import FastAPI
+from passlib.context import CryptContext
+
+from app import create_app
+from app.core.database import Base, engine, async_session_maker
+from app.models import UserModel
+
+ADMIN_EMAIL = "bench-admin@email.com"
+ADMIN_PASSWORD = "bench-admin-123"
+
+
+async def reset_database(confirmed: bool = False) -> None:
+    """Apaga e recria todas as tabelas; fora do SQLite exige `confirmed` (a flag `--reset` dos scripts)."""
+    if engine.dialect.name != "sqlite" and not confirmed:
+        raise SystemExit(
+            f"Recusando recriar as tabelas de um banco {engine.dialect.name} ({engine.url.render_as_string()}): "
+            "use --reset para confirmar (apaga os dados!)."
+        )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def create_admin(email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> UserModel:
+    async with async_session_maker() as session:
+        user = UserModel(
+            username="bench-admin",
+            email=email,
+            hashed_password=CryptContext(schemes=["bcrypt"]).hash(password),
+            is_active=True,
+            is_admin=True,
+        )
+        session.add(user)
+        await session.commit()
+        return user
+
+
+def make_client(app: FastAPI | None = None) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app or create_app()), base_url="http://benchmark")
+
+
+async def login(client: AsyncClient, email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> Dict[str, str]:
+    resp = await client.post("/auth/login", json={"email": email, "password": password})
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['token']['access_token']}"}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Resumo de latências (em segundos) convertido para milissegundos."""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples, default=0.0) * 1000, 2),
+    }
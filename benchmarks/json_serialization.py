@@ -0,0 +1,60 @@
+"""
+Linhas/s de GET /products/ com `limit` grande: caminho padrão (`response_model`) vs `FAST_JSON_RESPONSES`.
+
+A listagem de produtos fica no cache do catálogo após a primeira chamada, então a diferença
+medida é praticamente só validação + serialização da resposta.
+
+    python -m benchmarks.json_serialization --rows 5000 --limit 1000 --requests 50
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_admin, login, make_client, reset_database
+from benchmarks.product_import import make_row
+from app.core.config import settings
+from app.utils.fast_json import orjson
+
+
+async def measure(client, headers, limit: int, requests: int) -> float:
+    params = {"limit": limit, "offset": 0}
+    (await client.get("/products/", params=params, headers=headers)).raise_for_status()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        resp = await client.get("/products/", params=params, headers=headers)
+    elapsed = time.perf_counter() - start
+
+    assert len(resp.json()) == limit, resp.text
+    return requests * limit / elapsed
+
+
+async def main(rows: int, limit: int, requests: int, reset: bool) -> None:
+    await reset_database(confirmed=reset)
+    await create_admin()
+
+    async with make_client() as client:
+        headers = await login(client)
+        body = "\n".join(json.dumps(make_row(index)) for index in range(rows))
+        resp = await client.post("/products/import", content=body, headers={**headers, "Content-Type": "application/x-ndjson"})
+        resp.raise_for_status()
+
+        results = {}
+        for fast in (False, True):
+            settings.FAST_JSON_RESPONSES = fast
+            results[fast] = await measure(client, headers, limit, requests)
+
+    print(f"response_model (Pydantic):     {results[False]:>10.0f} linhas/s")
+    print(f"FAST_JSON_RESPONSES ({'orjson' if orjson else 'json'}): {results[True]:>10.0f} linhas/s "
+          f"({results[True] / results[False]:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--reset", action="store_true", help="permite recriar as tabelas fora do SQLite (apaga os dados!)")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.limit, args.requests, args.reset))
@@ -0,0 +1,211 @@
+"""
+Teste de carga por rota: vazão (req/s) e latência p50/p95/p99 de login, listagem de produtos,
+listagem de pedidos com filtros e leitura aninhada de pedido, com N clientes concorrentes.
+
+Por padrão chama o app de `create_app()` em processo (ASGI, sem rede); com `--base-url` mede um
+uvicorn de verdade (que precisa usar o mesmo `DATABASE_URL`, pois os dados são criados por aqui).
+
+Antes de medir, as tabelas são recriadas e populadas. Isso só acontece sozinho no SQLite
+(o banco temporário padrão); em outro banco é preciso confirmar com `--reset`, ou usar
+`--no-seed` para medir os dados já existentes.
+
+    python -m benchmarks.load_test --concurrency 16 --requests 400
+    python -m benchmarks.load_test --output resultado.json --baseline benchmarks/baseline.json
+    python -m benchmarks.load_test --save-baseline benchmarks/baseline.json
+
+Com `--baseline`, termina com código 1 se algum cenário ficar mais lento (p95) ou com menos
+vazão que o baseline além de `--tolerance`, ou se passar a responder com erro.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.common import ADMIN_EMAIL, ADMIN_PASSWORD, create_admin, login, make_client, reset_database, summarize
+from benchmarks.product_import import make_row
+from httpx import AsyncClient
+from app.core.database import async_session_maker, engine
+from app.models import ClientModel, OrderModel, OrderProductsModel, ProductModel
+
+STATUSES = ("pendente", "pago", "enviado", "entregue", "cancelado")
+
+# cenário -> (método, caminho, parâmetros/corpo); `{order_id}` é preenchido com um pedido existente
+Scenario = Tuple[str, str, Dict[str, Any]]
+SCENARIOS: Dict[str, Scenario] = {
+    "auth_login": ("POST", "/auth/login", {"json": {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}}),
+    "products_list": ("GET", "/products/", {"params": {"limit": 50}}),
+    "orders_list_filtered": ("GET", "/orders/", {"params": {"status": "pago", "section": "bebidas", "limit": 50}}),
+    "orders_nested": ("GET", "/orders/{order_id}", {"params": {"expand": "items.product,client"}}),
+}
+
+
+async def seed(products: int, orders: int, items: int, reset: bool) -> None:
+    await reset_database(confirmed=reset)
+    admin = await create_admin()
+
+    clients = max(1, orders // 10)
+
+    async with async_session_maker() as session:
+        session.add_all(ProductModel(**make_row(index)) for index in range(products))
+        session.add_all(
+            ClientModel(name=f"Cliente {index}", email=f"cliente{index}@bench.com", cpf_cnpj=f"{index:011d}", address=f"Rua {index}")
+            for index in range(clients)
+        )
+        await session.commit()
+
+        for index in range(orders):
+            order = OrderModel(
+                client_id=index % clients + 1, user_id=admin.id, status=STATUSES[index % len(STATUSES)], total_amount=0,
+                order_products=[
+                    OrderProductsModel(product_id=(index * items + offset) % products + 1, quantity=1, price_at_moment=10)
+                    for offset in range(items)
+                ],
+            )
+            session.add(order)
+        await session.commit()
+
+
+async def run_scenario(client: AsyncClient, headers: Dict[str, str], scenario: Scenario, concurrency: int, requests: int, warmup: int) -> Dict[str, Any]:
+    method, path, kwargs = scenario
+    samples: List[float] = []
+    statuses: Counter = Counter()
+
+    for _ in range(warmup):
+        await client.request(method, path, headers=headers, **kwargs)
+
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            resp = await client.request(method, path, headers=headers, **kwargs)
+            samples.append(time.perf_counter() - start)
+            statuses[resp.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        **summarize(samples),
+        "rps": round(len(samples) / elapsed, 1),
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Lista de regressões de `results` em relação ao `baseline` (cenários ausentes em um dos dois são ignorados)."""
+    regressions = []
+
+    for name, base in baseline["scenarios"].items():
+        current = results["scenarios"].get(name)
+        if current is None:
+            continue
+
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: vazão {base['rps']}/s -> {current['rps']}/s")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name}: erros {base['errors']} -> {current['errors']} ({current['statuses']})")
+
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    if not args.no_seed:
+        await seed(args.products, args.orders, args.items, args.reset)
+
+    selected: Dict[str, Scenario] = {name: SCENARIOS[name] for name in args.scenarios}
+    factory: Callable[[], AsyncClient] = (lambda: AsyncClient(base_url=args.base_url)) if args.base_url else make_client
+
+    async with factory() as client:
+        headers = await login(client)
+
+        first = (await client.get("/orders/", params={"limit": 1}, headers=headers)).json()
+        order_id = first[0]["id"] if first else 0
+
+        scenarios = {}
+        for name, (method, path, kwargs) in selected.items():
+            scenario = (method, path.format(order_id=order_id), kwargs)
+            # login é dominado pelo bcrypt e limitado pela admissão (`ADMISSION_AUTH_LIMIT`): roda com menos carga
+            if name == "auth_login":
+                scenarios[name] = await run_scenario(client, headers, scenario, args.login_concurrency, args.login_requests, args.warmup)
+            else:
+                scenarios[name] = await run_scenario(client, headers, scenario, args.concurrency, args.requests, args.warmup)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": args.base_url or "in-process",
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "login_concurrency": args.login_concurrency,
+            "login_requests": args.login_requests,
+            "products": args.products,
+            "orders": args.orders,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    meta = results["meta"]
+    print(
+        f"{meta['target']} ({meta['database']}), concorrência {meta['concurrency']} ({meta['login_concurrency']} no login),"
+        f" {meta['requests']} requisições por cenário ({meta['login_requests']} no login)"
+    )
+    for name, summary in results["scenarios"].items():
+        print(
+            f"  {name:<22} {summary['rps']:>8}/s  p50={summary['p50_ms']:>8}ms  p95={summary['p95_ms']:>8}ms"
+            f"  p99={summary['p99_ms']:>8}ms  erros={summary['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400, help="requisições medidas por cenário")
+    parser.add_argument("--login-concurrency", type=int, default=4)
+    parser.add_argument("--login-requests", type=int, default=50, help="requisições medidas no cenário de login")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=3, help="itens por pedido")
+    parser.add_argument("--base-url", help="mede um servidor já em execução em vez do app em processo")
+    parser.add_argument("--no-seed", action="store_true", help="usa os dados já existentes no banco")
+    parser.add_argument("--reset", action="store_true", help="permite recriar as tabelas fora do SQLite (apaga os dados!)")
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--baseline", help="compara com um resultado JSON anterior")
+    parser.add_argument("--save-baseline", help="grava os resultados como novo baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="variação aceita em relação ao baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+    print_results(results)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as fp:
+            json.dump(results, fp, indent=2, ensure_ascii=False)
+            fp.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as fp:
+            regressions = compare(results, json.load(fp), args.tolerance)
+
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"sem regressões em relação a {args.baseline} (tolerância {args.tolerance:.0%})")
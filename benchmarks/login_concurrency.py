@@ -0,0 +1,79 @@
+"""
+Latência de uma rota não relacionada (GET /products/) enquanto logins rodam em paralelo.
+
+Compara o bcrypt executado no event loop (comportamento antigo) com o pool limitado
+de `password_executor`.
+
+    python -m benchmarks.login_concurrency --logins 4 --requests 50
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from benchmarks.common import create_admin, login, make_client, reset_database, summarize, ADMIN_EMAIL, ADMIN_PASSWORD
+from app.models import ProductModel
+from app.core.database import async_session_maker
+from app.services import users as users_service
+
+
+class InlineExecutor:
+    """Executa a função diretamente no event loop, como antes do pool dedicado."""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+async def measure(client, headers: Dict[str, str], requests: int, logins: int) -> List[float]:
+    samples: List[float] = []
+    done = asyncio.Event()
+
+    async def login_loop():
+        while not done.is_set():
+            await client.post("/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+
+    async def probe():
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get("/products/", headers=headers)
+            samples.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+        done.set()
+
+    await asyncio.gather(probe(), *(login_loop() for _ in range(logins)))
+    return samples
+
+
+async def main(requests: int, logins: int, reset: bool) -> None:
+    await reset_database(confirmed=reset)
+    await create_admin()
+
+    async with async_session_maker() as session:
+        session.add(ProductModel(name="Produto benchmark", price=10, stock=10, barcode="bench-1"))
+        await session.commit()
+
+    pooled = users_service.password_executor
+
+    async with make_client() as client:
+        headers = await login(client)
+
+        results = {"idle": summarize(await measure(client, headers, requests, 0))}
+
+        users_service.password_executor = InlineExecutor()
+        results["logins_inline"] = summarize(await measure(client, headers, requests, logins))
+
+        users_service.password_executor = pooled
+        results["logins_pooled"] = summarize(await measure(client, headers, requests, logins))
+
+    print(f"GET /products/ com {logins} logins concorrentes")
+    for name, summary in results.items():
+        print(f"  {name:<14} p50={summary['p50_ms']:>8}ms  p99={summary['p99_ms']:>8}ms  max={summary['max_ms']:>8}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=4)
+    parser.add_argument("--reset", action="store_true", help="permite recriar as tabelas fora do SQLite (apaga os dados!)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.logins, args.reset))
@@ -0,0 +1,60 @@
+"""
+Taxa de ingestão (linhas/s) de POST /products/import comparada a um POST /products/ por produto.
+
+    python -m benchmarks.product_import --rows 20000 --batch-size 1000 --single 200
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_admin, login, make_client, reset_database
+
+
+def make_row(index: int) -> dict:
+    return {
+        "name": f"Produto {index}",
+        "description": None,
+        "price": f"{(index % 500) + 0.99:.2f}",
+        "barcode": f"import-{index:09d}",
+        "section": ("bebidas", "limpeza", "brinquedos", "mercearia")[index % 4],
+        "stock": index % 50,
+        "expiration_date": None,
+        "image_url": None,
+    }
+
+
+async def main(rows: int, batch_size: int, single: int, reset: bool) -> None:
+    await reset_database(confirmed=reset)
+    await create_admin()
+
+    async with make_client() as client:
+        headers = await login(client)
+
+        start = time.perf_counter()
+        for index in range(single):
+            await client.post("/products/", json=make_row(rows + index), headers=headers)
+        single_rate = single / (time.perf_counter() - start)
+
+        body = "\n".join(json.dumps(make_row(index)) for index in range(rows))
+        start = time.perf_counter()
+        resp = await client.post(
+            "/products/import", content=body, params={"batch_size": batch_size},
+            headers={**headers, "Content-Type": "application/x-ndjson"}
+        )
+        import_rate = rows / (time.perf_counter() - start)
+        report = resp.json()
+
+    print(f"POST /products/ (1 por produto): {single_rate:>10.0f} linhas/s")
+    print(f"POST /products/import (lotes de {batch_size}): {import_rate:>10.0f} linhas/s "
+          f"({report['imported']} importados, {len(report['errors'])} erros)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--single", type=int, default=200)
+    parser.add_argument("--reset", action="store_true", help="permite recriar as tabelas fora do SQLite (apaga os dados!)")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch_size, args.single, args.reset))
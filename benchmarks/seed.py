@@ -0,0 +1,305 @@
+"""
+Gera uma massa de dados sintética e referencialmente válida (usuários, clientes, produtos,
+pedidos e itens) para medir índices e paginação em volumes de produção.
+
+A distribuição imita o uso real:
+- produtos "quentes": a escolha do produto segue uma lei de Zipf (`--product-skew`);
+- clientes recorrentes: poucos clientes concentram muitos pedidos (`--client-skew`);
+- datas sazonais: picos em novembro/dezembro, mais pedidos em dias úteis e horário comercial,
+  e crescimento ao longo do período.
+
+A carga é feita em lotes: `COPY` (asyncpg) no PostgreSQL e `executemany` nos demais bancos.
+Os IDs são atribuídos aqui (continuando do maior ID existente), então os dados podem ser
+acrescentados a um banco já populado; ao final as sequências do PostgreSQL são ajustadas e
+o resumo `sales_daily` é recalculado.
+
+    python -m benchmarks.seed --orders 1000000 --products 50000 --clients 200000
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.seed --orders 5000000 --batch-size 50000
+
+Todos os usuários gerados usam a senha `--password` (o primeiro é admin).
+"""
+import argparse
+import asyncio
+import random
+import time
+from bisect import bisect
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from itertools import accumulate
+from typing import Any, Dict, List, Sequence
+
+from benchmarks.common import reset_database
+from passlib.context import CryptContext
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.core.database import engine
+from app.models import ClientModel, OrderModel, OrderProductsModel, ProductModel, SalesDailyModel, UserModel
+
+SECTIONS = ("mercearia", "bebidas", "limpeza", "higiene", "hortifruti", "padaria", "brinquedos", "eletrônicos")
+SECTION_WEIGHTS = (30, 20, 12, 12, 10, 8, 5, 3)
+STATUSES = ("pendente", "pago", "enviado", "entregue", "cancelado")
+STATUS_WEIGHTS = (5, 10, 10, 70, 5)
+# peso relativo por mês (jan..dez) e por dia da semana (seg..dom)
+MONTH_WEIGHTS = (0.8, 0.75, 0.9, 0.9, 1.0, 0.95, 1.0, 0.95, 0.95, 1.05, 1.6, 1.9)
+WEEKDAY_WEIGHTS = (1.0, 1.05, 1.05, 1.1, 1.25, 0.9, 0.6)
+HOUR_WEIGHTS = (1, 1, 1, 1, 1, 2, 4, 8, 12, 14, 15, 15, 13, 13, 14, 14, 13, 12, 11, 10, 8, 6, 3, 2)
+ITEM_COUNT_WEIGHTS = (35, 25, 15, 10, 6, 4, 3, 2)
+
+
+def zipf_cum_weights(n: int, skew: float, rng: random.Random) -> List[float]:
+    """
+    Pesos acumulados de Zipf (`1 / rank^skew`) para `n` itens, com os ranks embaralhados
+    para que os itens "quentes" não sejam simplesmente os primeiros IDs.
+    """
+    ranks = list(range(1, n + 1))
+    rng.shuffle(ranks)
+    return list(accumulate(1 / rank ** skew for rank in ranks))
+
+
+def seasonal_cum_weights(start: date, days: int, growth: float) -> List[float]:
+    weights = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        trend = 1 + growth * offset / max(days - 1, 1)
+        weights.append(MONTH_WEIGHTS[day.month - 1] * WEEKDAY_WEIGHTS[day.weekday()] * trend)
+    return list(accumulate(weights))
+
+
+def sample_distinct(rng: random.Random, cum_weights: Sequence[float], k: int, n: int) -> List[int]:
+    """`k` índices distintos em `range(n)` segundo `cum_weights` (rejeita repetidos)."""
+    chosen: Dict[int, None] = {}
+    total = cum_weights[-1]
+    while len(chosen) < min(k, n):
+        chosen[bisect(cum_weights, rng.random() * total)] = None
+    return list(chosen)
+
+
+async def max_id(conn: AsyncConnection, table: Table) -> int:
+    return (await conn.execute(select(func.coalesce(func.max(table.c.id), 0)))).scalar_one()
+
+
+async def load(conn: AsyncConnection, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """Insere um lote: `COPY` no PostgreSQL (asyncpg), `executemany` nos demais."""
+    if not rows:
+        return
+
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg":
+        columns = list(rows[0])
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=[tuple(row[column] for column in columns) for row in rows], columns=columns
+        )
+    else:
+        await conn.execute(table.insert(), rows)
+
+
+class Seeder:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.counts: Dict[str, int] = {}
+        self.product_sections: Dict[int, str] = {}
+
+    async def run(self, conn: AsyncConnection) -> None:
+        args = self.args
+        await self.users(conn, args.users)
+        product_prices = await self.products(conn, args.products)
+        client_ids = await self.clients(conn, args.clients)
+        await self.orders(conn, args.orders, client_ids, product_prices)
+        await self.finish(conn)
+
+    async def users(self, conn: AsyncConnection, count: int) -> None:
+        start = await max_id(conn, UserModel.__table__)
+        # bcrypt é caro: todos os usuários compartilham o mesmo hash
+        hashed = CryptContext(schemes=["bcrypt"]).hash(self.args.password)
+        rows = [
+            {
+                "id": start + index + 1,
+                "username": f"usuario{start + index + 1}",
+                "email": f"usuario{start + index + 1}@seed.com",
+                "hashed_password": hashed,
+                "is_active": True,
+                "is_admin": index == 0,
+            }
+            for index in range(count)
+        ]
+        await load(conn, UserModel.__table__, rows)
+        await conn.commit()
+        self.user_ids = [row["id"] for row in rows] or list(range(1, start + 1))
+        self.counts["users"] = count
+
+    async def products(self, conn: AsyncConnection, count: int) -> Dict[int, Decimal]:
+        start = await max_id(conn, ProductModel.__table__)
+        rng = self.rng
+        sections = rng.choices(SECTIONS, weights=SECTION_WEIGHTS, k=count)
+        prices: Dict[int, Decimal] = {}
+
+        for batch_start in range(0, count, self.args.batch_size):
+            rows = []
+            for index in range(batch_start, min(count, batch_start + self.args.batch_size)):
+                id = start + index + 1
+                # preços com cauda longa: muitos itens baratos, poucos caros
+                price = Decimal(f"{min(rng.lognormvariate(3, 1), 9999):.2f}") + Decimal("0.99")
+                prices[id] = price
+                self.product_sections[id] = sections[index]
+                rows.append({
+                    "id": id,
+                    "name": f"Produto {id}",
+                    "description": None,
+                    "price": price,
+                    "barcode": f"seed-{id:012d}",
+                    "section": sections[index],
+                    "stock": rng.randint(0, 500),
+                })
+            await load(conn, ProductModel.__table__, rows)
+            await conn.commit()
+
+        self.counts["products"] = count
+        return prices
+
+    async def clients(self, conn: AsyncConnection, count: int) -> List[int]:
+        start = await max_id(conn, ClientModel.__table__)
+
+        for batch_start in range(0, count, self.args.batch_size):
+            rows = [
+                {
+                    "id": start + index + 1,
+                    "name": f"Cliente {start + index + 1}",
+                    "email": f"cliente{start + index + 1}@seed.com",
+                    "phone": f"+55{start + index + 1:011d}",
+                    "cpf_cnpj": f"{start + index + 1:011d}",
+                    "address": f"Rua Sintética, {start + index + 1}",
+                }
+                for index in range(batch_start, min(count, batch_start + self.args.batch_size))
+            ]
+            await load(conn, ClientModel.__table__, rows)
+            await conn.commit()
+
+        self.counts["clients"] = count
+        return list(range(start + 1, start + count + 1))
+
+    async def orders(self, conn: AsyncConnection, count: int, client_ids: List[int], product_prices: Dict[int, Decimal]) -> None:
+        if not count:
+            return
+        if not client_ids or not product_prices or not self.user_ids:
+            raise SystemExit("Pedidos precisam de ao menos um usuário, um cliente e um produto (use --users/--clients/--products).")
+
+        args, rng = self.args, self.rng
+        product_ids = list(product_prices)
+        product_weights = zipf_cum_weights(len(product_ids), args.product_skew, rng)
+        client_weights = zipf_cum_weights(len(client_ids), args.client_skew, rng)
+
+        days = (args.date_end - args.date_start).days + 1
+        day_weights = seasonal_cum_weights(args.date_start, days, args.growth)
+        order_id = await max_id(conn, OrderModel.__table__)
+        item_id = await max_id(conn, OrderProductsModel.__table__)
+        items_total = 0
+
+        for batch_start in range(0, count, args.batch_size):
+            size = min(args.batch_size, count - batch_start)
+            # sorteios do lote de uma vez (`choices(k=...)`), em vez de um por linha
+            clients = rng.choices(client_ids, cum_weights=client_weights, k=size)
+            offsets = rng.choices(range(days), cum_weights=day_weights, k=size)
+            hours = rng.choices(range(24), weights=HOUR_WEIGHTS, k=size)
+            statuses = rng.choices(STATUSES, weights=STATUS_WEIGHTS, k=size)
+            item_counts = rng.choices(range(1, len(ITEM_COUNT_WEIGHTS) + 1), weights=ITEM_COUNT_WEIGHTS, k=size)
+
+            orders, items = [], []
+            for index in range(size):
+                order_id += 1
+                created_at = datetime.combine(args.date_start + timedelta(days=offsets[index]), datetime.min.time(), timezone.utc) + timedelta(
+                    hours=hours[index], seconds=rng.randrange(3600)
+                )
+                total = Decimal(0)
+
+                for product_index in sample_distinct(rng, product_weights, item_counts[index], len(product_ids)):
+                    item_id += 1
+                    product_id = product_ids[product_index]
+                    quantity = 1 + int(rng.expovariate(0.8))
+                    total += product_prices[product_id] * quantity
+                    items.append({
+                        "id": item_id,
+                        "order_id": order_id,
+                        "product_id": product_id,
+                        "quantity": quantity,
+                        "price_at_moment": product_prices[product_id],
+                        "section": self.product_sections[product_id],
+                        "created_at": created_at,
+                    })
+
+                orders.append({
+                    "id": order_id,
+                    "client_id": clients[index],
+                    "user_id": rng.choice(self.user_ids),
+                    "status": statuses[index],
+                    "total_amount": total,
+                    "created_at": created_at,
+                })
+
+            await load(conn, OrderModel.__table__, orders)
+            await load(conn, OrderProductsModel.__table__, items)
+            await conn.commit()
+            items_total += len(items)
+            print(f"  pedidos: {batch_start + size}/{count}", flush=True)
+
+        self.counts["orders"] = count
+        self.counts["order_products"] = items_total
+
+    async def finish(self, conn: AsyncConnection) -> None:
+        """Ajusta as sequências (IDs foram atribuídos aqui) e recalcula `sales_daily` como a migração de backfill."""
+        if conn.dialect.name == "postgresql":
+            for table in ("users", "clients", "products", "orders", "order_products"):
+                await conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+                ))
+            day = "(o.created_at AT TIME ZONE 'UTC')::date"
+        else:
+            day = "date(o.created_at)"
+
+        await conn.execute(SalesDailyModel.__table__.delete())
+        await conn.execute(text(
+            "INSERT INTO sales_daily (day, section, product_id, quantity, revenue, order_lines) "
+            f"SELECT {day}, COALESCE(op.section, ''), op.product_id, SUM(op.quantity), SUM(op.quantity * op.price_at_moment), COUNT(*) "
+            "FROM order_products op "
+            "JOIN orders o ON o.id = op.order_id "
+            f"GROUP BY {day}, COALESCE(op.section, ''), op.product_id"
+        ))
+
+        if conn.dialect.name == "postgresql":
+            for table in ("users", "clients", "products", "orders", "order_products", "sales_daily"):
+                await conn.execute(text(f"ANALYZE {table}"))
+        await conn.commit()
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.reset:
+        await reset_database(confirmed=True)
+
+    seeder = Seeder(args)
+    start = time.perf_counter()
+
+    async with engine.connect() as conn:
+        await seeder.run(conn)
+
+    elapsed = time.perf_counter() - start
+    rows = sum(seeder.counts.values())
+    print(f"{rows} linhas em {elapsed:.1f}s ({rows / elapsed:.0f} linhas/s, {engine.dialect.name}): {seeder.counts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=10000, help="linhas por lote de COPY/executemany")
+    parser.add_argument("--product-skew", type=float, default=1.1, help="expoente de Zipf da popularidade dos produtos")
+    parser.add_argument("--client-skew", type=float, default=0.8, help="expoente de Zipf da recorrência dos clientes")
+    parser.add_argument("--date-start", type=date.fromisoformat, default=date.today() - timedelta(days=730))
+    parser.add_argument("--date-end", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--growth", type=float, default=0.5, help="crescimento do volume diário ao longo do período (0.5 = +50%%)")
+    parser.add_argument("--password", default="seed-password", help="senha de todos os usuários gerados")
+    parser.add_argument("--seed", type=int, default=42, help="semente do gerador (mesma semente, mesmos dados)")
+    parser.add_argument("--reset", action="store_true", help="recria todas as tabelas antes (apaga os dados!)")
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,74 @@
+"""
+Muitos checkouts concorrentes disputando o estoque de um único produto.
+
+Confere que nunca há venda além do estoque (201 == estoque inicial, estoque final == 0,
+demais respostas 409) e mostra a latência dos checkouts, que não deve crescer com filas de lock.
+
+    python -m benchmarks.stock_contention --stock 200 --buyers 50 --attempts 10
+
+Com SQLite só há um escritor por vez; para medir contenção de verdade use `DATABASE_URL` de um PostgreSQL.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+from benchmarks.common import create_admin, login, make_client, reset_database, summarize
+from app.core.database import async_session_maker
+from app.models import ClientModel, ProductModel
+
+
+async def main(stock: int, buyers: int, attempts: int, reset: bool) -> None:
+    await reset_database(confirmed=reset)
+    admin = await create_admin()
+
+    async with async_session_maker() as session:
+        product = ProductModel(name="Produto disputado", price=10, stock=stock, barcode="hot-product")
+        client = ClientModel(name="Cliente", email="cliente@bench.com", cpf_cnpj="00000000000", address=f"Rua {uuid.uuid4().hex}")
+        session.add_all([product, client])
+        await session.commit()
+
+    statuses: Counter = Counter()
+    samples: List[float] = []
+
+    async with make_client() as http:
+        headers = await login(http)
+        body = {
+            "client_id": client.id, "user_id": admin.id, "status": "pendente",
+            "items": [{"product_id": product.id, "quantity": 1}],
+        }
+
+        async def buyer():
+            for _ in range(attempts):
+                start = time.perf_counter()
+                resp = await http.post("/orders/checkout", json=body, headers=headers)
+                samples.append(time.perf_counter() - start)
+                statuses[resp.status_code] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(buyer() for _ in range(buyers)))
+        elapsed = time.perf_counter() - start
+
+    async with async_session_maker() as session:
+        final_stock = (await session.get(ProductModel, product.id)).stock
+
+    sold = statuses[201]
+    print(f"checkouts: {sum(statuses.values())} em {elapsed:.2f}s ({sum(statuses.values()) / elapsed:.0f}/s)  respostas: {dict(statuses)}")
+    print(f"estoque: inicial={stock} vendido={sold} final={final_stock}")
+    print(f"latência: {summarize(samples)}")
+
+    assert final_stock == stock - sold >= 0, "venda além do estoque!"
+    assert sold == min(stock, buyers * attempts), "checkouts recusados com estoque disponível"
+    print("ok: sem venda além do estoque")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stock", type=int, default=200)
+    parser.add_argument("--buyers", type=int, default=50)
+    parser.add_argument("--attempts", type=int, default=10)
+    parser.add_argument("--reset", action="store_true", help="permite recriar as tabelas fora do SQLite (apaga os dados!)")
+    args = parser.parse_args()
+    asyncio.run(main(args.stock, args.buyers, args.attempts, args.reset))
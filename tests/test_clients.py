@@ -2,6 +2,7 @@ import uuid
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from app.utils.cursor import encode_cursor
 
 # Função helper para garantir clientes únicos em cada teste
 def make_unique_client():
@@ -97,3 +98,86 @@ async def test_create_duplicate_client(auth_client):
     resp2 = await auth_client.post("/clients/", json=client_data)
     assert resp2.status_code == 409
     assert "já cadastrado" in resp2.text
+
+@pytest.mark.asyncio
+async def test_list_clients_cursor(auth_client):
+    for _ in range(3):
+        resp = await auth_client.post("/clients/", json=make_unique_client())
+        assert resp.status_code == 201, resp.text
+
+    first = await auth_client.get("/clients/", params={"cursor": "", "limit": 2})
+    assert first.status_code == 200
+    page = first.json()
+    assert len(page["items"]) == 2
+    assert page["next_cursor"]
+
+    second = await auth_client.get("/clients/", params={"cursor": page["next_cursor"], "limit": 2})
+    assert second.status_code == 200
+    first_ids = {item["id"] for item in page["items"]}
+    assert not first_ids & {item["id"] for item in second.json()["items"]}
+
+@pytest.mark.asyncio
+async def test_list_clients_invalid_cursor(auth_client):
+    response = await auth_client.get("/clients/", params={"cursor": "invalido"})
+    assert response.status_code == 400
+
+    # estrutura certa, tipos trocados (forjado)
+    forged = encode_cursor(1, "a")
+    response = await auth_client.get("/clients/", params={"cursor": forged})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_clients_limit_bounds(auth_client):
+    for limit in (0, 10**9):
+        response = await auth_client.get("/clients/", params={"cursor": "", "limit": limit})
+        assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_create_duplicate_client_reports_all_columns(auth_client):
+    client_data = make_unique_client()
+    resp1 = await auth_client.post("/clients/", json=client_data)
+    assert resp1.status_code == 201, resp1.text
+    # Mesmo email e cpf_cnpj, demais campos novos
+    duplicate = make_unique_client()
+    duplicate["email"] = client_data["email"]
+    duplicate["cpf_cnpj"] = client_data["cpf_cnpj"]
+    resp2 = await auth_client.post("/clients/", json=duplicate)
+    assert resp2.status_code == 409
+    assert "email" in resp2.json()["detail"]
+    assert "cpf_cnpj" in resp2.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_search_clients_typo(auth_client):
+    client_data = make_unique_client()
+    resp = await auth_client.post("/clients/", json=client_data)
+    assert resp.status_code == 201, resp.text
+    # Troca o último caractere do nome para simular erro de digitação
+    typo = client_data["name"][:-1] + ("x" if client_data["name"][-1] != "x" else "y")
+    response = await auth_client.get("/clients/", params={"q": typo})
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["id"] == resp.json()["id"]
+
+@pytest.mark.asyncio
+async def test_get_clients_batch(auth_client):
+    """GET /clients/batch devolve os clientes na ordem pedida, lista os inexistentes e recusa IDs inválidos."""
+    ids = []
+    for _ in range(2):
+        resp = await auth_client.post("/clients/", json=make_unique_client())
+        assert resp.status_code == 201, resp.text
+        ids.append(resp.json()["id"])
+
+    response = await auth_client.get("/clients/batch", params={"ids": f"{ids[1]},999999999,{ids[0]}"})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [ids[1], ids[0]]
+    assert data["missing"] == [999999999]
+
+    for value in ("abc", "0", "-1", "99999999999999999999"):
+        invalid = await auth_client.get("/clients/batch", params={"ids": f"{ids[0]},{value}"})
+        assert invalid.status_code == 400, value
+
+    # o limite vale para os valores recebidos, antes de remover repetidos
+    too_many = await auth_client.get("/clients/batch", params={"ids": ",".join([str(ids[0])] * 201)})
+    assert too_many.status_code == 400
+
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from app.core.admission import AdmissionClass, classify
+from app.routes import monitoring
+
+BASE_URL = "http://127.0.0.1:8000"
+
+@pytest_asyncio.fixture
+async def client():
+    async with AsyncClient(base_url=BASE_URL) as ac:
+        yield ac
+
+@pytest.mark.asyncio
+async def test_health(client):
+    response = await client.get("/health")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ok"
+    assert set(body["admission"]) == {"auth", "list", "default"}
+
+@pytest.mark.asyncio
+async def test_ready(client):
+    response = await client.get("/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ok"
+    assert body["reasons"] == []
+    assert "pool" in body
+
+@pytest.mark.asyncio
+async def test_admission_class_sheds_load():
+    """Com a vaga ocupada e a fila cheia, novas requisições são recusadas em vez de esperar."""
+    admission = AdmissionClass("test", limit=1, queue_size=1, timeout=0.05)
+
+    assert await admission.acquire()
+    waiter = asyncio.create_task(admission.acquire())
+    await asyncio.sleep(0)
+    assert admission.saturated
+
+    assert not await admission.acquire()  # fila cheia: recusa imediata
+    assert not await waiter               # esperou além do timeout
+    assert admission.rejected == 2
+
+    admission.release()
+    assert await admission.acquire()
+    assert admission.stats()["in_flight"] == 1
+
+@pytest.mark.asyncio
+async def test_metrics_by_route_template(client):
+    """As métricas usam o template da rota (`/orders/{id}`), não o caminho com o ID."""
+    await client.get("/orders/123")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/orders/{id}",status="401"}' in body
+    assert "/orders/123" not in body
+    assert "http_request_duration_seconds_bucket" in body
+    assert "http_request_db_queries_bucket" in body
+    assert "db_queries_total" in body
+
+@pytest.mark.asyncio
+async def test_ready_times_out_on_hanging_database(monkeypatch):
+    """Se o checkout/conexão com o banco trava, /ready responde 503 em ~1s em vez de ficar pendurado."""
+    async def hanging():
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(monitoring, "ping_database", hanging)
+    response = await asyncio.wait_for(monitoring.ready(), timeout=5)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_register_is_admitted_as_auth():
+    """Registro também roda bcrypt: entra no limite de autenticação."""
+    assert classify("POST", "/auth/register") == "auth"
+
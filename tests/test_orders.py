@@ -1,3 +1,4 @@
+import json
 import uuid
 import pytest
 import pytest_asyncio
@@ -53,7 +54,7 @@ async def make_client(auth_client: AsyncClient) -> int:
         "cpf_cnpj": str(uuid.uuid4().int)[:11],
         "email": make_unique_email(),
         "phone": str(uuid.uuid4().int)[:11],
-        "address": f"Rua Teste, {str(uuid.uuid4().int)[:3]}"
+        "address": f"Rua Teste, {uuid.uuid4().hex[:8]}"
     }
     res = await auth_client.post("/clients/", json=client_payload)
     assert res.status_code == 201, f"Não registrou client: {res.text}"
@@ -162,3 +163,291 @@ async def test_list_orders_filters(auth_client, make_client, make_user):
     assert res.status_code == 200
     for item in res.json():
         assert item["status"] == "entregue"
+
+@pytest.mark.asyncio
+async def test_list_orders_pagination(auth_client, make_client, make_user):
+    """GET /orders/?limit=1 deve respeitar o limite da página."""
+    for amount in ("10.00", "20.00"):
+        await auth_client.post("/orders/", json={
+            "client_id": make_client,
+            "user_id": make_user,
+            "status": "pendente",
+            "total_amount": amount
+        })
+
+    res = await auth_client.get("/orders/", params={"limit": 1})
+    assert res.status_code == 200
+    assert len(res.json()) == 1
+
+@pytest.mark.asyncio
+async def test_list_orders_stream(auth_client, make_client, make_user):
+    """GET /orders/?stream=true deve responder NDJSON, um pedido por linha."""
+    await auth_client.post("/orders/", json={
+        "client_id": make_client,
+        "user_id": make_user,
+        "status": "pendente",
+        "total_amount": "15.00"
+    })
+
+    res = await auth_client.get("/orders/", params={"stream": True, "client_id": make_client})
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in res.text.splitlines() if line]
+    assert lines and all(line["client_id"] == make_client for line in lines)
+
+@pytest_asyncio.fixture
+async def make_product(auth_client: AsyncClient):
+    """
+    Retorna uma função que cria um produto com o preço informado e devolve o seu ID.
+    """
+    async def _make_product(price: str) -> int:
+        payload = {
+            "name": make_unique_name("product"),
+            "description": None,
+            "price": price,
+            "barcode": uuid.uuid4().hex[:12],
+            "section": "brinquedos",
+            "stock": 100,
+            "expiration_date": None,
+            "image_url": None
+        }
+        res = await auth_client.post("/products/", json=payload)
+        assert res.status_code == 201, f"Não registrou product: {res.text}"
+        return res.json()["id"]
+    return _make_product
+
+@pytest.mark.asyncio
+async def test_checkout_order(auth_client, make_client, make_user, make_product):
+    """POST /orders/checkout cria pedido e itens juntos, com total calculado no servidor."""
+    first = await make_product("10.00")
+    second = await make_product("2.50")
+    body = {
+        "client_id": make_client,
+        "user_id": make_user,
+        "status": "pendente",
+        "items": [
+            {"product_id": first, "quantity": 2},
+            {"product_id": second, "quantity": 4},
+            {"product_id": first, "quantity": 1},
+        ]
+    }
+    res = await auth_client.post("/orders/checkout", json=body)
+    assert res.status_code == 201, res.text
+    js = res.json()
+    assert float(js["total_amount"]) == 40.0
+    quantities = {item["product_id"]: item["quantity"] for item in js["items"]}
+    assert quantities == {first: 3, second: 4}
+    assert all(item["order_id"] == js["id"] for item in js["items"])
+
+@pytest.mark.asyncio
+async def test_checkout_order_missing_product(auth_client, make_client, make_user):
+    """POST /orders/checkout com produto inexistente deve retornar 404 sem criar o pedido."""
+    body = {
+        "client_id": make_client,
+        "user_id": make_user,
+        "status": "pendente",
+        "items": [{"product_id": 999999, "quantity": 1}]
+    }
+    res = await auth_client.post("/orders/checkout", json=body)
+    assert res.status_code == 404
+
+@pytest.mark.asyncio
+async def test_checkout_order_missing_user(auth_client, make_client, make_product):
+    """POST /orders/checkout com usuário inexistente deve retornar 404 (e não 500)."""
+    product_id = await make_product("1.00")
+    body = {
+        "client_id": make_client,
+        "user_id": 999999999,
+        "status": "pendente",
+        "items": [{"product_id": product_id, "quantity": 1}]
+    }
+    res = await auth_client.post("/orders/checkout", json=body)
+    assert res.status_code == 404, res.text
+    assert res.json()["detail"] == "Usuário referente ao ID: 999999999 não encontrado."
+
+@pytest.mark.asyncio
+async def test_get_order_expanded(auth_client, make_client, make_user, make_product):
+    """GET /orders/{id}?expand=items.product,client devolve o recibo completo numa requisição."""
+    product_id = await make_product("5.00")
+    create = await auth_client.post("/orders/checkout", json={
+        "client_id": make_client,
+        "user_id": make_user,
+        "status": "pendente",
+        "items": [{"product_id": product_id, "quantity": 2}]
+    })
+    assert create.status_code == 201, create.text
+    order_id = create.json()["id"]
+
+    res = await auth_client.get(f"/orders/{order_id}", params={"expand": "items.product,client"})
+    assert res.status_code == 200, res.text
+    js = res.json()
+    assert js["client"]["id"] == make_client
+    assert js["items"][0]["product"]["id"] == product_id
+
+    flat = await auth_client.get(f"/orders/{order_id}")
+    assert "items" not in flat.json() and "client" not in flat.json()
+
+    invalid = await auth_client.get(f"/orders/{order_id}", params={"expand": "user"})
+    assert invalid.status_code == 400
+
+@pytest.mark.asyncio
+async def test_get_orders_batch(auth_client, make_client, make_user, make_product):
+    """GET /orders/batch aceita `expand` e mantém a ordem dos IDs pedidos."""
+    product_id = await make_product("3.00")
+    order_ids = []
+    for _ in range(2):
+        create = await auth_client.post("/orders/checkout", json={
+            "client_id": make_client,
+            "user_id": make_user,
+            "status": "pendente",
+            "items": [{"product_id": product_id, "quantity": 1}]
+        })
+        assert create.status_code == 201, create.text
+        order_ids.append(create.json()["id"])
+
+    ids = f"{order_ids[1]},999999999,{order_ids[0]}"
+    res = await auth_client.get("/orders/batch", params={"ids": ids, "expand": "items,client"})
+    assert res.status_code == 200, res.text
+    js = res.json()
+    assert [order["id"] for order in js["items"]] == [order_ids[1], order_ids[0]]
+    assert js["missing"] == [999999999]
+    assert js["items"][0]["client"]["id"] == make_client
+    assert js["items"][0]["items"][0]["product_id"] == product_id
+
+    flat = await auth_client.get("/orders/batch", params={"ids": ids})
+    assert "items" not in flat.json()["items"][0]
+
+@pytest.mark.asyncio
+async def test_sales_report_follows_order_items(auth_client, make_client, make_user, make_product):
+    """O resumo em /reports/sales acompanha checkout, alteração e remoção de itens na mesma transação."""
+    product_id = await make_product("4.00")
+    create = await auth_client.post("/orders/checkout", json={
+        "client_id": make_client,
+        "user_id": make_user,
+        "status": "pendente",
+        "items": [{"product_id": product_id, "quantity": 3}]
+    })
+    assert create.status_code == 201, create.text
+    item_id = create.json()["items"][0]["id"]
+
+    async def report():
+        res = await auth_client.get("/reports/sales", params={"product_id": product_id, "by_product": True})
+        assert res.status_code == 200, res.text
+        return res.json()
+
+    rows = await report()
+    assert len(rows) == 1
+    assert rows[0]["quantity"] == 3 and float(rows[0]["revenue"]) == 12.0 and rows[0]["section"] == "brinquedos"
+
+    # mudar a seção do produto depois da venda não pode desviar os estornos para outra linha do resumo
+    res = await auth_client.patch(f"/products/{product_id}", json={"section": "outra-secao"})
+    assert res.status_code == 200, res.text
+
+    res = await auth_client.patch(f"/order-products/{item_id}", json={"quantity": 5})
+    assert res.status_code == 200, res.text
+    rows = await report()
+    assert len(rows) == 1
+    assert rows[0]["quantity"] == 5 and float(rows[0]["revenue"]) == 20.0 and rows[0]["section"] == "brinquedos"
+
+    res = await auth_client.delete(f"/orders/{create.json()['id']}")
+    assert res.status_code == 204, res.text
+    assert await report() == []
+
+@pytest.mark.asyncio
+async def test_checkout_insufficient_stock(auth_client, make_client, make_user, make_product):
+    """Checkout além do estoque responde 409 sem baixar nada; remover o pedido devolve o estoque."""
+    product_id = await make_product("1.00")
+    body = {"client_id": make_client, "user_id": make_user, "status": "pendente"}
+
+    res = await auth_client.post("/orders/checkout", json={**body, "items": [{"product_id": product_id, "quantity": 101}]})
+    assert res.status_code == 409, res.text
+    assert (await auth_client.get(f"/products/{product_id}")).json()["stock"] == 100
+
+    res = await auth_client.post("/orders/checkout", json={**body, "items": [{"product_id": product_id, "quantity": 60}]})
+    assert res.status_code == 201, res.text
+    assert (await auth_client.get(f"/products/{product_id}")).json()["stock"] == 40
+
+    await auth_client.delete(f"/orders/{res.json()['id']}")
+    assert (await auth_client.get(f"/products/{product_id}")).json()["stock"] == 100
+
+@pytest.mark.asyncio
+async def test_order_item_rejects_non_positive_quantity(auth_client, make_client, make_user, make_product):
+    """Quantidade negativa ou zero em um item responde 422, sem devolver estoque ao produto."""
+    product_id = await make_product("1.00")
+    res = await auth_client.post("/orders/checkout", json={
+        "client_id": make_client, "user_id": make_user, "status": "pendente",
+        "items": [{"product_id": product_id, "quantity": 5}]
+    })
+    assert res.status_code == 201, res.text
+
+    for quantity in (-50, 0):
+        item = await auth_client.post("/order-products/", json={
+            "order_id": res.json()["id"], "product_id": product_id, "quantity": quantity, "price_at_moment": "1.00"
+        })
+        assert item.status_code == 422, item.text
+    assert (await auth_client.get(f"/products/{product_id}")).json()["stock"] == 95
+
+@pytest.mark.asyncio
+async def test_sold_out_product_leaves_cached_availability_listing(auth_client, make_client, make_user):
+    """Após vender todo o estoque, a listagem `availability=true` (em cache) não mostra mais o produto."""
+    section = make_unique_name("secao")
+    res = await auth_client.post("/products/", json={
+        "name": make_unique_name("product"), "description": None, "price": "2.00",
+        "barcode": uuid.uuid4().hex[:12], "section": section, "stock": 1,
+        "expiration_date": None, "image_url": None
+    })
+    assert res.status_code == 201, res.text
+    product_id = res.json()["id"]
+
+    params = {"section": section, "availability": "true"}
+    before = await auth_client.get("/products/", params=params)
+    assert [item["id"] for item in before.json()] == [product_id]
+
+    checkout = await auth_client.post("/orders/checkout", json={
+        "client_id": make_client,
+        "user_id": make_user,
+        "status": "pendente",
+        "items": [{"product_id": product_id, "quantity": 1}]
+    })
+    assert checkout.status_code == 201, checkout.text
+
+    after = await auth_client.get("/products/", params=params)
+    assert after.status_code == 200
+    assert after.json() == []
+
+@pytest.mark.asyncio
+async def test_list_orders_by_section_no_duplicates(auth_client, make_client, make_user, make_product):
+    """Filtrar por seção retorna cada pedido uma vez, mesmo com vários itens da seção."""
+    first = await make_product("1.00")
+    second = await make_product("2.00")
+    create = await auth_client.post("/orders/checkout", json={
+        "client_id": make_client,
+        "user_id": make_user,
+        "status": "pendente",
+        "items": [{"product_id": first, "quantity": 1}, {"product_id": second, "quantity": 1}]
+    })
+    assert create.status_code == 201, create.text
+
+    res = await auth_client.get("/orders/", params={"section": "brinquedos", "client_id": make_client})
+    assert res.status_code == 200
+    assert [order["id"] for order in res.json()] == [create.json()["id"]]
+
+    res = await auth_client.get("/orders/", params={"product_id": second, "section": "brinquedos"})
+    assert create.json()["id"] in [order["id"] for order in res.json()]
+
+@pytest.mark.asyncio
+async def test_list_orders_total_count(auth_client, make_client, make_user):
+    """GET /orders/ informa o total filtrado em X-Total-Count, independente de `limit`."""
+    for amount in ("10.00", "20.00", "30.00"):
+        await auth_client.post("/orders/", json={
+            "client_id": make_client,
+            "user_id": make_user,
+            "status": "pendente",
+            "total_amount": amount
+        })
+
+    res = await auth_client.get("/orders/", params={"client_id": make_client, "limit": 1})
+    assert res.status_code == 200
+    assert len(res.json()) == 1
+    assert res.headers["X-Total-Count"] == "3"
+    assert res.headers["X-Total-Count-Estimated"] == "false"
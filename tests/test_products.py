@@ -1,8 +1,13 @@
+import json
 import uuid
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from datetime import datetime, timezone
 from decimal import Decimal
+from types import SimpleNamespace
+from app.schemas.products import ProductDetailsSchema
+from app.utils.fast_json import fast_json_response
 
 # Helper para produto único
 def make_unique_product():
@@ -101,3 +106,118 @@ async def test_create_duplicate_product_barcode(auth_admin_client):
     resp2 = await auth_admin_client.post("/products/", json=product_data)
     assert resp2.status_code == 409
     assert "já foi cadastrado" in resp2.text
+
+@pytest.mark.asyncio
+async def test_list_products_cursor(auth_admin_client):
+    for _ in range(3):
+        resp = await auth_admin_client.post("/products/", json=make_unique_product())
+        assert resp.status_code == 201, resp.text
+
+    first = await auth_admin_client.get("/products/", params={"cursor": "", "limit": 2})
+    assert first.status_code == 200
+    page = first.json()
+    assert len(page["items"]) == 2
+    assert page["next_cursor"]
+
+    second = await auth_admin_client.get("/products/", params={"cursor": page["next_cursor"], "limit": 2})
+    assert second.status_code == 200
+    names = [item["name"] for item in page["items"] + second.json()["items"]]
+    assert names == sorted(names)
+
+@pytest.mark.asyncio
+async def test_list_products_section_ignores_surrounding_spaces(auth_admin_client):
+    product = dict(make_unique_product(), section=f"secao{uuid.uuid4().hex[:8]}")
+    resp = await auth_admin_client.post("/products/", json=product)
+    assert resp.status_code == 201, resp.text
+
+    # mesma chave de cache e mesma consulta: os espaços não mudam o resultado
+    for section in (f"  {product['section']} ", product["section"].upper()):
+        response = await auth_admin_client.get("/products/", params={"section": section})
+        assert response.status_code == 200, response.text
+        assert [item["id"] for item in response.json()] == [resp.json()["id"]]
+
+@pytest.mark.asyncio
+async def test_import_products_ndjson(auth_admin_client):
+    existing = make_unique_product()
+    resp = await auth_admin_client.post("/products/", json=existing)
+    assert resp.status_code == 201, resp.text
+
+    updated = dict(existing, name="Produto Importado", stock=5)
+    new = make_unique_product()
+    body = "\n".join([json.dumps(updated), json.dumps(new), json.dumps({"name": "sem preço"})])
+    response = await auth_admin_client.post(
+        "/products/import", content=body, params={"batch_size": 2},
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["received"] == 3
+    assert report["imported"] == 2
+    assert [error["line"] for error in report["errors"]] == [3]
+
+    data = (await auth_admin_client.get(f"/products/{resp.json()['id']}")).json()
+    assert data["name"] == "Produto Importado"
+    assert data["stock"] == 5
+
+@pytest.mark.asyncio
+async def test_import_products_csv(auth_admin_client):
+    product = make_unique_product()
+    body = "name,description,price,barcode,section,stock,expiration_date,image_url\n"
+    body += f"{product['name']},,12.50,{product['barcode']},brinquedos,3,2030-01-01,\n"
+    response = await auth_admin_client.post(
+        "/products/import", content=body, headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 1
+    assert response.json()["errors"] == []
+
+@pytest.mark.asyncio
+async def test_product_cache_invalidated_on_update(auth_admin_client):
+    product_data = make_unique_product()
+    create_resp = await auth_admin_client.post("/products/", json=product_data)
+    assert create_resp.status_code == 201, create_resp.text
+    product_id = create_resp.json()["id"]
+
+    # primeira leitura popula o cache, a segunda deve vir dele
+    await auth_admin_client.get(f"/products/{product_id}")
+    before = (await auth_admin_client.get("/admin/cache/products")).json()["entities"]["hits"]
+    await auth_admin_client.get(f"/products/{product_id}")
+    after = (await auth_admin_client.get("/admin/cache/products")).json()["entities"]["hits"]
+    assert after == before + 1
+
+    await auth_admin_client.patch(f"/products/{product_id}", json={"name": "Nome Novo"})
+    response = await auth_admin_client.get(f"/products/{product_id}")
+    assert response.json()["name"] == "Nome Novo"
+
+@pytest.mark.asyncio
+async def test_get_products_batch(auth_admin_client):
+    """GET /products/batch devolve os produtos na ordem pedida e lista os IDs inexistentes."""
+    ids = []
+    for _ in range(3):
+        resp = await auth_admin_client.post("/products/", json=make_unique_product())
+        assert resp.status_code == 201, resp.text
+        ids.append(resp.json()["id"])
+
+    await auth_admin_client.get(f"/products/{ids[1]}")  # um deles já no cache
+
+    requested = [ids[2], 999999999, ids[0], ids[1], ids[2]]
+    response = await auth_admin_client.get("/products/batch", params={"ids": ",".join(map(str, requested))})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [ids[2], ids[0], ids[1]]
+    assert data["missing"] == [999999999]
+
+    invalid = await auth_admin_client.get("/products/batch", params={"ids": "1,abc"})
+    assert invalid.status_code == 400
+
+def test_fast_json_matches_response_model():
+    """O caminho rápido deve gerar o mesmo JSON que o `response_model`."""
+    row = SimpleNamespace(
+        id=1, name="Produto", description=None, price=Decimal("10.50"), barcode="123", section="bebidas",
+        stock=3, expiration_date=datetime(2030, 1, 1, tzinfo=timezone.utc), image_url=None,
+        created_at=datetime(2024, 5, 1, 12, 30, 15, 123456), updated_at=datetime(2024, 5, 1, 12, 30, 15),
+    )
+
+    fast = json.loads(fast_json_response([row], ProductDetailsSchema).body)
+    expected = [ProductDetailsSchema.model_validate(row).model_dump(mode="json")]
+    assert fast == expected
@@ -0,0 +1,215 @@
+import logging
+import pytest
+import pytest_asyncio
+from collections import Counter
+from decimal import Decimal
+from httpx import ASGITransport, AsyncClient
+from fastapi import HTTPException
+from jose import jwt
+from sqlalchemy import event, update
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from app.core import cache, query_log
+from app.core.config import settings
+from app.core.database import Base
+from app.core.query_log import instrument_engine, redact, request_statements
+from app.core.security import locked_route, token_versions, user_cache
+from app.core.replica import READ_YOUR_WRITES_COOKIE, ReadYourWritesMiddleware, wrote_recently
+from app.models.clients import ClientModel
+from app.models.order_products import OrderProductsModel
+from app.models.orders import OrderModel
+from app.models.products import ProductModel
+from app.models.users import UserModel
+from app.repositories.orders import OrderRepository
+from app.repositories.products import ProductRepository
+from app.schemas.orders import OrderExpandedSchema
+from app.schemas.products import ProductUpdateSchema
+from app.services.products import ProductService
+from tests.conftest import engine, TestingSessionLocal
+
+@pytest_asyncio.fixture
+async def session():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with TestingSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+@pytest.fixture
+def statements():
+    """Captura os comandos SQL enviados ao banco durante o teste."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+@pytest.mark.asyncio
+async def test_create_is_single_statement(session, statements):
+    repo = ProductRepository(session)
+    product = await repo.create(ProductModel(name="Produto", price=Decimal("9.90"), barcode="stmt-create"))
+
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT")
+    assert product.created_at is not None
+    assert product.stock == 0
+
+@pytest.mark.asyncio
+async def test_update_is_single_statement(session, statements):
+    repo = ProductRepository(session)
+    product = await repo.create(ProductModel(name="Produto", price=Decimal("9.90"), barcode="stmt-update"))
+    statements.clear()
+
+    product = await repo.update(product, ProductUpdateSchema(name="Produto Atualizado"))
+
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE")
+    assert product.updated_at is not None
+
+@pytest.mark.asyncio
+async def test_order_expand_uses_fixed_number_of_queries(session, statements):
+    user = UserModel(username="user", email="user@email.com", hashed_password="x")
+    client = ClientModel(name="Cliente", email="cliente@email.com", cpf_cnpj="12345678901", address="Rua A, 1")
+    products = [ProductModel(name=f"Produto {i}", price=Decimal("1.50"), barcode=f"expand-{i}") for i in range(5)]
+    session.add_all([user, client, *products])
+    await session.flush()
+
+    for _ in range(3):
+        order = OrderModel(client_id=client.id, user_id=user.id, status="pendente", total_amount=Decimal("7.50"))
+        order.order_products = [OrderProductsModel(product_id=p.id, quantity=1, price_at_moment=p.price) for p in products]
+        session.add(order)
+    await session.commit()
+    session.expunge_all()
+    statements.clear()
+
+    expand = frozenset({"items", "items.product", "client"})
+    orders = await OrderRepository(session).list(expand=expand)
+    receipts = [OrderExpandedSchema.from_order(order, expand) for order in orders]
+
+    # pedidos + cliente (JOIN), itens e produtos: 3 consultas, independente da quantidade de pedidos/itens
+    assert len(statements) == 3
+    assert all(len(receipt.items) == 5 and receipt.items[0].product is not None for receipt in receipts)
+    assert receipts[0].client.id == client.id
+
+@pytest.mark.asyncio
+async def test_query_log_detects_repeated_statements(session, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.000001)
+    instrument_engine(engine.sync_engine)
+
+    repo = ProductRepository(session)
+    statements = Counter()
+    token = request_statements.set(statements)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.db"):
+            for id in range(5):
+                await repo.get_by_id(id)
+    finally:
+        request_statements.reset(token)
+        for name, fn in (("before_cursor_execute", query_log._before_cursor_execute), ("after_cursor_execute", query_log._after_cursor_execute), ("handle_error", query_log._handle_error)):
+            event.remove(engine.sync_engine, name, fn)
+
+    assert max(statements.values()) == 5
+    # consultas lentas são logadas sem os valores dos parâmetros
+    assert "consulta lenta" in caplog.text and "<int>" in caplog.text
+
+def test_query_log_redacts_parameters():
+    assert redact({"email": "a@b.com", "id": 1}, False) == "{email: <str>, id: <int>}"
+    assert redact(("segredo",), False) == "(<str>)"
+    assert redact([{"a": 1}, {"a": 2}], True) == "<2 linhas>"
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_cookie_survives_other_workers(session):
+    """Quem grava recebe o cookie; com ele, outro worker (sem o cache local) também lê do primário."""
+    async def app(scope, receive, send):
+        session.info["user_id"] = 1
+        session.add(ProductModel(name="Produto", price=Decimal("1.00"), stock=1))
+        await session.commit()
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    async with AsyncClient(transport=ASGITransport(app=ReadYourWritesMiddleware(app)), base_url="http://test") as client:
+        response = await client.get("/")
+
+    until = response.cookies[READ_YOUR_WRITES_COOKIE]
+    request = Request({"type": "http", "headers": [(b"cookie", f"{READ_YOUR_WRITES_COOKIE}={until}".encode())]})
+    assert wrote_recently(request, user_id=999)
+    assert not wrote_recently(Request({"type": "http", "headers": []}), user_id=999)
+
+
+@pytest.mark.asyncio
+async def test_token_version_bump_rejected_after_ttl(session, monkeypatch):
+    """Versão incrementada por outro worker (sem `invalidate_user` aqui) passa a valer ao expirar o TTL."""
+    user = UserModel(username="u", email="u@email.com", hashed_password="x", is_active=True, is_admin=False)
+    session.add(user)
+    await session.commit()
+    token_versions.invalidate(user.id)
+
+    token = jwt.encode({"sub": str(user.id), "ver": 0, "is_admin": False, "is_active": True}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    assert (await locked_route(token, session)).id == user.id
+
+    await session.execute(update(UserModel).where(UserModel.id == user.id).values(token_version=UserModel.token_version + 1))
+    await session.commit()
+
+    # dentro do TTL o worker ainda usa a versão em cache (limite documentado em TOKEN_VERSION_TTL_SECONDS)
+    assert (await locked_route(token, session)).id == user.id
+
+    now = cache.monotonic()
+    monkeypatch.setattr(cache, "monotonic", lambda: now + settings.TOKEN_VERSION_TTL_SECONDS + 1)
+    with pytest.raises(HTTPException) as exc:
+        await locked_route(token, session)
+    assert exc.value.status_code == 401
+    token_versions.invalidate(user.id)
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_refreshed_after_ttl(session, monkeypatch):
+    """Token só com `sub`: desativação feita por outro worker passa a valer ao expirar `USER_CACHE_TTL_SECONDS`."""
+    user = UserModel(username="c", email="c@email.com", hashed_password="x", is_active=True, is_admin=True)
+    session.add(user)
+    await session.commit()
+    user_cache.invalidate(user.id)
+
+    token = jwt.encode({"sub": str(user.id)}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    assert (await locked_route(token, session)).is_admin
+
+    await session.execute(update(UserModel).where(UserModel.id == user.id).values(is_active=False, is_admin=False))
+    await session.commit()
+    assert (await locked_route(token, session)).is_admin  # ainda em cache
+
+    now = cache.monotonic()
+    monkeypatch.setattr(cache, "monotonic", lambda: now + settings.USER_CACHE_TTL_SECONDS + 1)
+    with pytest.raises(HTTPException) as exc:
+        await locked_route(token, session)
+    assert exc.value.status_code == 403
+    user_cache.invalidate(user.id)
+
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_isolates_rows_rejected_by_database(session):
+    """Um lote recusado pelo banco é regravado em partes: só a linha inválida fica de fora, sem o erro do driver."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "CREATE TRIGGER reject_product BEFORE INSERT ON products WHEN NEW.name = 'recusado' "
+            "BEGIN SELECT RAISE(ABORT, 'reject_product'); END"
+        )
+
+    async def records():
+        for line, name in enumerate(["a", "b", "recusado", "c", "d"], start=1):
+            yield line, {
+                "name": name, "description": None, "price": "1.00", "barcode": f"import-{name}",
+                "section": None, "stock": 1, "expiration_date": None, "image_url": None,
+            }
+
+    report = await ProductService(ProductRepository(session)).bulk_import(records(), batch_size=5)
+
+    assert report["imported"] == 4
+    assert [error["line"] for error in report["errors"]] == [3]
+    assert "reject_product" not in report["errors"][0]["detail"]
+    assert (await ProductRepository(session).count())[0] == 4
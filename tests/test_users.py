@@ -147,3 +147,41 @@ async def test_authenticated_access(auth_client):
     # Exemplo: acessa rota protegida (ajuste conforme necessário)
     response = await auth_client.get("/clients/", headers=headers)
     assert response.status_code in (200, 404)
+
+# --- Teste do cache de usuários autenticados ---
+@pytest.mark.asyncio
+async def test_users_cache_stats(auth_client):
+    await auth_client.get("/clients/")
+    response = await auth_client.get("/admin/cache/users")
+    assert response.status_code == 200
+    data = response.json()
+    # o token de login leva claims: só a versão do token é consultada/cacheada
+    assert data["token_versions"]["hits"] >= 1
+    assert {"size", "maxsize", "misses", "hit_ratio"} <= data["users"].keys()
+
+# --- Teste das métricas do pool de conexões ---
+@pytest.mark.asyncio
+async def test_database_pool_stats(auth_client):
+    response = await auth_client.get("/admin/pool")
+    assert response.status_code == 200
+    assert "pool" in response.json()
+
+# --- Tokens com claims são revogados ao alterar o usuário ---
+@pytest.mark.asyncio
+async def test_password_change_revokes_tokens(auth_client):
+    user = make_unique_user()
+    created = await auth_client.post("/auth/register", json=user)
+    assert created.status_code == 201, created.text
+    user_id = created.json()["id"]
+
+    async with AsyncClient(base_url=BASE_URL) as ac:
+        login = await ac.post("/auth/login", json={"email": user["email"], "password": user["password"]})
+        headers = {"Authorization": f"Bearer {login.json()['token']['access_token']}"}
+        assert (await ac.get("/clients/", headers=headers)).status_code in (200, 404)
+
+        response = await auth_client.put(f"/auth/users/{user_id}", json={"password": "nova-senha-123"})
+        assert response.status_code == 200, response.text
+
+        assert (await ac.get("/clients/", headers=headers)).status_code == 401
+        login = await ac.post("/auth/login", json={"email": user["email"], "password": "nova-senha-123"})
+        assert login.status_code == 200